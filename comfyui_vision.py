@@ -7,95 +7,181 @@ This enables asking questions like "What website is this?" or "What text is visi
 Requirements:
     - ComfyUI running on localhost:8188
     - BLIP nodes installed in ComfyUI
+    - urllib3 (pooled HTTP connections)
+    - websocket-client (optional, for event-driven completion)
 """
 
 import base64
 import io
+import itertools
 import json
+import threading
 import time
 import uuid
 from typing import Optional
-from urllib import request, error
+
+import urllib3
+from urllib3.filepost import encode_multipart_formdata
 from PIL import Image
 
+# Optional: WebSocket client for execution events (falls back to polling)
+try:
+    import websocket
+    _websocket_available = True
+except ImportError:
+    _websocket_available = False
+
 COMFYUI_URL = "http://localhost:8188"
 
+# Image formats this Pillow build can write (WebP support is optional)
+_registered_extensions = Image.registered_extensions()
+
+# Shared connection pool - keeps the localhost socket alive between requests
+_http = urllib3.PoolManager(num_pools=1, maxsize=4, block=False, retries=False)
+
+# Identifies this process to ComfyUI so execution events are routed to our socket
+CLIENT_ID = uuid.uuid4().hex
+
+# Upload names and multipart boundary are generated once, not per upload
+_upload_counter = itertools.count()
+_BOUNDARY = uuid.uuid4().hex
+
+# Persistent WebSocket connection (opened lazily)
+_ws = None
+
+# Cached availability probe - ComfyUI rarely comes or goes between calls
+AVAILABILITY_TTL = 5.0
+_availability = {"ts": 0.0, "ok": False}
+
+
+def get_websocket():
+    """Get the ComfyUI WebSocket connection (lazy connect)."""
+    global _ws
+
+    if _ws is None:
+        ws_url = COMFYUI_URL.replace("http", "ws", 1)
+        _ws = websocket.create_connection(f"{ws_url}/ws?clientId={CLIENT_ID}", timeout=5)
+
+    return _ws
+
+
+def close_websocket():
+    """Close the ComfyUI WebSocket connection if open."""
+    global _ws
+
+    if _ws is not None:
+        try:
+            _ws.close()
+        except Exception:
+            pass
+        _ws = None
+
 
 def check_comfyui_available() -> bool:
-    """Check if ComfyUI is running and accessible."""
+    """Check if ComfyUI is running and accessible.
+
+    The result is cached for AVAILABILITY_TTL seconds.
+    """
+    now = time.monotonic()
+    if now - _availability["ts"] < AVAILABILITY_TTL:
+        return _availability["ok"]
+
     try:
-        req = request.urlopen(f"{COMFYUI_URL}/system_stats", timeout=5)
-        return req.status == 200
+        response = _http.request("GET", f"{COMFYUI_URL}/system_stats", timeout=5)
+        ok = response.status == 200
     except:
-        return False
+        ok = False
 
+    _availability["ts"] = now
+    _availability["ok"] = ok
+    return ok
 
-def upload_image(image: Image.Image, name: str = None) -> str:
-    """Upload an image to ComfyUI and return the filename."""
-    if name is None:
-        name = f"screenshot_{uuid.uuid4().hex[:8]}.png"
 
-    # Convert image to bytes
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    image_bytes = buffer.getvalue()
+def invalidate_availability():
+    """Force the next check_comfyui_available() call to probe the server."""
+    _availability["ts"] = 0.0
 
-    # Create multipart form data
-    boundary = uuid.uuid4().hex
 
-    body = (
-        f'--{boundary}\r\n'
-        f'Content-Disposition: form-data; name="image"; filename="{name}"\r\n'
-        f'Content-Type: image/png\r\n\r\n'
-    ).encode('utf-8') + image_bytes + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+def upload_image(image: Image.Image, name: str = None, fmt: str = "webp") -> str:
+    """Upload an image to ComfyUI and return the filename.
 
-    headers = {
-        'Content-Type': f'multipart/form-data; boundary={boundary}',
-        'Content-Length': str(len(body))
-    }
+    Args:
+        image: PIL Image to upload
+        name: Filename to upload as (generated if not given)
+        fmt: "webp" (fast, small - plenty for BLIP) or "png" (lossless)
+    """
+    if fmt == "webp" and ".webp" not in _registered_extensions:
+        fmt = "png"
 
-    req = request.Request(
-        f"{COMFYUI_URL}/upload/image",
-        data=body,
-        headers=headers,
-        method='POST'
-    )
+    if name is None:
+        name = f"screenshot_{CLIENT_ID[:8]}_{next(_upload_counter):06d}.{fmt}"
+
+    # Convert image to bytes (a view of the buffer, not a copy)
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, format="WEBP", quality=85, method=0)
+    else:
+        image.save(buffer, format="PNG", compress_level=1)
+    image_bytes = buffer.getbuffer()
+
+    # Create multipart form data - written once into a single body buffer
+    body, content_type = encode_multipart_formdata({
+        "image": (name, image_bytes, f"image/{fmt}")
+    }, boundary=_BOUNDARY)
+    headers = {'Content-Type': content_type}
 
     try:
-        response = request.urlopen(req, timeout=30)
-        result = json.loads(response.read().decode('utf-8'))
+        response = _http.request(
+            "POST",
+            f"{COMFYUI_URL}/upload/image",
+            body=body,
+            headers=headers,
+            timeout=30
+        )
+        result = json.loads(response.data.decode('utf-8'))
         return result.get('name', name)
     except Exception as e:
         print(f"Upload error: {e}")
+        invalidate_availability()
         return name
 
 
 def queue_prompt(workflow: dict) -> str:
     """Queue a workflow and return the prompt_id."""
-    data = json.dumps({"prompt": workflow}).encode('utf-8')
-    req = request.Request(
+    # Connect before queueing so the completion event can't be missed
+    if _websocket_available:
+        try:
+            get_websocket()
+        except Exception as e:
+            print(f"WebSocket unavailable, falling back to polling: {e}")
+
+    data = json.dumps({"prompt": workflow, "client_id": CLIENT_ID}).encode('utf-8')
+    response = _http.request(
+        "POST",
         f"{COMFYUI_URL}/prompt",
-        data=data,
+        body=data,
         headers={'Content-Type': 'application/json'},
-        method='POST'
+        timeout=30
     )
-    response = request.urlopen(req, timeout=30)
-    result = json.loads(response.read().decode('utf-8'))
+    if response.status != 200:
+        raise RuntimeError(f"ComfyUI rejected prompt ({response.status}): {response.data.decode('utf-8')}")
+    result = json.loads(response.data.decode('utf-8'))
     return result['prompt_id']
 
 
 def get_history(prompt_id: str) -> Optional[dict]:
     """Get the execution history for a prompt."""
     try:
-        req = request.urlopen(f"{COMFYUI_URL}/history/{prompt_id}", timeout=10)
-        history = json.loads(req.read().decode('utf-8'))
+        response = _http.request("GET", f"{COMFYUI_URL}/history/{prompt_id}", timeout=10)
+        history = json.loads(response.data.decode('utf-8'))
         return history.get(prompt_id)
     except:
+        invalidate_availability()
         return None
 
 
-def wait_for_completion(prompt_id: str, timeout: float = 60) -> Optional[dict]:
-    """Wait for a prompt to complete and return results."""
+def poll_for_completion(prompt_id: str, timeout: float = 60) -> Optional[dict]:
+    """Poll the history endpoint until a prompt completes."""
     start = time.time()
     while time.time() - start < timeout:
         history = get_history(prompt_id)
@@ -105,6 +191,42 @@ def wait_for_completion(prompt_id: str, timeout: float = 60) -> Optional[dict]:
     return None
 
 
+def wait_for_completion(prompt_id: str, timeout: float = 60) -> Optional[dict]:
+    """Wait for a prompt to complete and return results.
+
+    Blocks on ComfyUI's WebSocket until an 'executing' message with no node
+    is received for this prompt, then fetches the history once. Falls back
+    to polling if the WebSocket client is unavailable or the socket fails.
+    """
+    if not _websocket_available or _ws is None:
+        return poll_for_completion(prompt_id, timeout)
+
+    deadline = time.time() + timeout
+    try:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            _ws.settimeout(remaining)
+            message = _ws.recv()
+
+            # Binary frames are live previews - skip them
+            if not isinstance(message, str):
+                continue
+
+            msg = json.loads(message)
+            if msg.get('type') == 'executing':
+                data = msg.get('data', {})
+                if data.get('node') is None and data.get('prompt_id') == prompt_id:
+                    return get_history(prompt_id)
+    except websocket.WebSocketTimeoutException:
+        return None
+    except Exception as e:
+        print(f"WebSocket error, falling back to polling: {e}")
+        close_websocket()
+        return poll_for_completion(prompt_id, max(deadline - time.time(), 0))
+
+
 def create_blip_workflow(image_filename: str, mode: str = "caption", question: str = "") -> dict:
     """Create a BLIP analysis workflow.
 
@@ -210,6 +332,7 @@ def analyze_image(image: Image.Image, mode: str = "caption", question: str = "",
         return "Timeout waiting for ComfyUI response"
 
     except Exception as e:
+        invalidate_availability()
         return f"Error: {e}"
 
 
@@ -232,13 +355,21 @@ def ask_about_screenshot(image: Image.Image, question: str) -> str:
 # Test functions
 # ============================================================================
 
+_sct = None
+_sct_lock = threading.Lock()
+
+
 def capture_screen() -> Image.Image:
     """Capture the current screen."""
-    import mss
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]
-        screenshot = sct.grab(monitor)
-        return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    global _sct
+
+    with _sct_lock:
+        if _sct is None:
+            import mss
+            _sct = mss.mss()
+        screenshot = _sct.grab(_sct.monitors[1])
+    # .raw is the grab buffer itself; .bgra would copy it to bytes first
+    return Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
 
 
 def test_comfyui_connection():
@@ -249,8 +380,8 @@ def test_comfyui_connection():
         print("  ComfyUI is available!")
 
         # Get system info
-        req = request.urlopen(f"{COMFYUI_URL}/system_stats")
-        info = json.loads(req.read().decode('utf-8'))
+        response = _http.request("GET", f"{COMFYUI_URL}/system_stats")
+        info = json.loads(response.data.decode('utf-8'))
         print(f"  Version: {info['system']['comfyui_version']}")
         print(f"  GPU: {info['devices'][0]['name']}")
         print(f"  VRAM Free: {info['devices'][0]['vram_free'] / 1e9:.1f} GB")
@@ -266,7 +397,7 @@ def test_image_upload():
 
     # Create a simple test image
     img = Image.new('RGB', (100, 100), color='red')
-    filename = upload_image(img, "test_image.png")
+    filename = upload_image(img, "test_image.png", fmt="png")
     print(f"  Uploaded as: {filename}")
     return filename
 
@@ -280,7 +411,7 @@ def test_blip_caption():
     img = capture_screen()
 
     # Resize for faster processing (BLIP doesn't need full 4K)
-    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    img.thumbnail((1024, 1024), Image.Resampling.BILINEAR)
     print(f"  Resized to: {img.size}")
 
     # Get caption
@@ -296,7 +427,7 @@ def test_blip_question():
 
     # Capture screen
     img = capture_screen()
-    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    img.thumbnail((1024, 1024), Image.Resampling.BILINEAR)
 
     # Ask a question
     question = "What website or application is shown in this image?"
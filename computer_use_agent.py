@@ -7,10 +7,13 @@ control the desktop through screenshots, mouse, and keyboard actions.
 Requires: anthropic, pyautogui, mss, Pillow
 """
 
+import asyncio
 import base64
 import io
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Callable
 
 import anthropic
@@ -18,10 +21,31 @@ import mss
 import pyautogui
 from PIL import Image
 
+import win_input
+
 # Safety settings for pyautogui
 pyautogui.FAILSAFE = True  # Move mouse to corner to abort
 pyautogui.PAUSE = 0.1  # Small pause between actions
 
+# Model name fragment -> (computer tool type, beta flag); first match wins
+MODEL_TOOL_VERSIONS = (
+    ("opus-4-5", ("computer_20251124", "computer-use-2025-11-24")),
+)
+DEFAULT_TOOL_VERSION = ("computer_20250124", "computer-use-2025-01-24")
+
+# Actions that never change the screen, so they can share the previous capture
+READ_ONLY_ACTIONS = frozenset({"screenshot"})
+
+DEFAULT_SYSTEM_PROMPT = """You are a computer use agent that can control a Windows desktop.
+You can see the screen through screenshots and interact using mouse and keyboard.
+
+Guidelines:
+- Take a screenshot first to see the current state
+- Use keyboard shortcuts when possible (e.g., Win+R for Run dialog)
+- Verify actions succeeded by taking screenshots
+- Be precise with click coordinates
+- Wait briefly after actions that trigger UI changes"""
+
 
 @dataclass
 class DisplayConfig:
@@ -45,11 +69,69 @@ class DisplayConfig:
 class ScreenCapture:
     """Handles screenshot capture on Windows."""
 
-    def __init__(self, config: DisplayConfig, max_dimension: int = 1280):
+    # format name -> (PIL format, media type, save options)
+    FORMATS = {
+        "jpeg": ("JPEG", "image/jpeg", {"quality": 80}),
+        "webp": ("WEBP", "image/webp", {"quality": 80, "method": 0}),
+        "png": ("PNG", "image/png", {"compress_level": 1}),
+    }
+
+    def __init__(self, config: DisplayConfig, max_dimension: int = 1280, screenshot_format: str = "jpeg"):
+        if screenshot_format not in self.FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {screenshot_format}")
         self.config = config
         self.max_dimension = max_dimension
+        self._pil_format, self.media_type, self._save_options = self.FORMATS[screenshot_format]
         self._scale_factor = self._calculate_scale_factor()
 
+        # BOX is exact and near-free for integer-ratio downscales (e.g. 3840 -> 1280)
+        max_actual = max(self.config.width, self.config.height)
+        if max_actual % self.max_dimension == 0:
+            self._resample = Image.Resampling.BOX
+        else:
+            self._resample = Image.Resampling.BILINEAR
+
+        # Keep mss contexts alive instead of reopening one per capture. mss 9.x-10.1
+        # keeps its Windows GDI handles thread-local, so each capturing thread
+        # (normally just the agent's screenshot worker) gets its own, made on first use.
+        self._local = threading.local()
+        self._contexts = []
+        self._contexts_lock = threading.Lock()
+
+        # Encode buffer reused across captures; it only ever grows, and stale
+        # bytes past the current image are ignored. Not thread-safe - captures
+        # must be serialized.
+        self._buffer = io.BytesIO()
+
+    def _get_sct(self) -> "mss.base.MSSBase":
+        """Get the calling thread's mss context, creating it on first use."""
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+            with self._contexts_lock:
+                self._contexts.append(sct)
+        return sct
+
+    def close(self):
+        """Release the screen capture contexts.
+
+        Contexts made on other threads are closed best-effort; mss may only be
+        able to free their handles from the thread that made them.
+        """
+        if getattr(self, "_contexts_lock", None) is None:
+            return
+        with self._contexts_lock:
+            contexts, self._contexts = self._contexts, []
+        self._local = threading.local()
+        for sct in contexts:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+    def __del__(self):
+        self.close()
+
     def _calculate_scale_factor(self) -> float:
         """Calculate scale factor to keep screenshots under max dimension."""
         max_actual = max(self.config.width, self.config.height)
@@ -58,26 +140,30 @@ class ScreenCapture:
         return self.max_dimension / max_actual
 
     def capture(self) -> str:
-        """Capture screenshot and return as base64-encoded PNG."""
-        with mss.mss() as sct:
-            monitor = sct.monitors[self.config.display_number]
-            screenshot = sct.grab(monitor)
-
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+        """Capture screenshot and return as base64-encoded image (see media_type)."""
+        sct = self._get_sct()
+        screenshot = sct.grab(sct.monitors[self.config.display_number])
 
-            # Resize if needed for API efficiency
-            if self._scale_factor < 1.0:
-                new_size = (
-                    int(img.width * self._scale_factor),
-                    int(img.height * self._scale_factor)
-                )
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
+        if self._scale_factor < 1.0:
+            # Resize for API efficiency. Wrap the raw BGRA buffer without copying
+            # (channels are mislabelled, which resampling doesn't care about) and
+            # only reorder channels on the much smaller result.
+            bgrx = Image.frombuffer("RGBX", screenshot.size, screenshot.raw, "raw", "RGBX", 0, 1)
+            new_size = (
+                int(bgrx.width * self._scale_factor),
+                int(bgrx.height * self._scale_factor)
+            )
+            b, g, r, _ = bgrx.resize(new_size, self._resample).split()
+            img = Image.merge("RGB", (r, g, b))
+        else:
+            img = Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
 
-            # Convert to base64 PNG
-            buffer = io.BytesIO()
-            img.save(buffer, format="PNG", optimize=True)
-            return base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
+        # Convert to base64 in the configured format
+        self._buffer.seek(0)
+        img.save(self._buffer, format=self._pil_format, **self._save_options)
+        size = self._buffer.tell()
+        with self._buffer.getbuffer() as view, view[:size] as data:
+            return base64.standard_b64encode(data).decode("utf-8")
 
     def scale_coordinates(self, x: int, y: int) -> tuple[int, int]:
         """Scale coordinates from API space to actual screen space."""
@@ -95,10 +181,18 @@ class ActionExecutor:
     def __init__(self, screen_capture: ScreenCapture):
         self.screen = screen_capture
 
+        # Map action names to bound handlers once, e.g. "left_click" -> self._action_left_click
+        prefix = "_action_"
+        self._dispatch = {
+            name[len(prefix):]: getattr(self, name)
+            for name in dir(self)
+            if name.startswith(prefix)
+        }
+
     def execute(self, action: str, **params) -> str:
         """Execute a computer use action and return result."""
         try:
-            handler = getattr(self, f"_action_{action}", None)
+            handler = self._dispatch.get(action)
             if handler is None:
                 return f"Unknown action: {action}"
             return handler(**params)
@@ -147,7 +241,12 @@ class ActionExecutor:
         return f"Dragged from ({sx}, {sy}) to ({ex}, {ey})"
 
     def _action_type(self, text: str, **_) -> str:
-        pyautogui.typewrite(text, interval=0.02)
+        if win_input.AVAILABLE:
+            # Whole string in one SendInput batch; still honor the corner failsafe
+            pyautogui.failSafeCheck()
+            win_input.type_text(text)
+        else:
+            pyautogui.typewrite(text, interval=0.02)
         return f"Typed: {text[:50]}{'...' if len(text) > 50 else ''}"
 
     def _action_key(self, key: str, **_) -> str:
@@ -181,6 +280,13 @@ class ActionExecutor:
         return f"Holding key: {key}"
 
 
+@dataclass
+class ToolBatch:
+    """Tool results from one assistant turn and the screenshot that follows them."""
+    tool_results: list[dict] = field(default_factory=list)
+    screenshot: Future | None = None
+
+
 class ComputerUseAgent:
     """
     Agent that allows Claude to control the computer.
@@ -189,6 +295,9 @@ class ComputerUseAgent:
         agent = ComputerUseAgent()
         result = agent.run("Open notepad and type 'Hello World'")
         print(result)
+
+        # Or from async code
+        result = await agent.arun("Open notepad and type 'Hello World'")
     """
 
     def __init__(
@@ -196,28 +305,31 @@ class ComputerUseAgent:
         model: str = "claude-sonnet-4-20250514",
         display_config: DisplayConfig | None = None,
         max_iterations: int = 50,
-        callback: Callable[[str, dict], None] | None = None
+        callback: Callable[[str, dict], None] | None = None,
+        keep_screenshots: int = 2
     ):
         self.client = anthropic.Anthropic()
+        self.aclient = anthropic.AsyncAnthropic()
         self.model = model
         self.config = display_config or DisplayConfig.from_primary_monitor()
         self.max_iterations = max_iterations
         self.callback = callback or (lambda action, params: None)
+        self.keep_screenshots = keep_screenshots
 
         self.screen = ScreenCapture(self.config)
         self.executor = ActionExecutor(self.screen)
 
+        # Captures the post-action screenshot off the main thread
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+
         # Determine tool version based on model
-        if "opus-4-5" in model:
-            self.tool_type = "computer_20251124"
-            self.beta_flag = "computer-use-2025-11-24"
-        else:
-            self.tool_type = "computer_20250124"
-            self.beta_flag = "computer-use-2025-01-24"
+        self.tool_type, self.beta_flag = next(
+            (version for fragment, version in MODEL_TOOL_VERSIONS if fragment in model),
+            DEFAULT_TOOL_VERSION
+        )
+        self._betas = [self.beta_flag]
 
-    def _get_computer_tool(self) -> dict:
-        """Get the computer tool definition for the API."""
-        return {
+        self._tool_def = {
             "type": self.tool_type,
             "name": "computer",
             "display_width_px": self.config.width,
@@ -225,6 +337,16 @@ class ComputerUseAgent:
             "display_number": self.config.display_number
         }
 
+    def close(self):
+        """Stop the screenshot worker and release the screen capture contexts."""
+        # mss contexts must be closed on the thread that made them
+        self._pool.submit(self.screen.close).result()
+        self._pool.shutdown(wait=True)
+
+    def _get_computer_tool(self) -> dict:
+        """Get the computer tool definition for the API."""
+        return self._tool_def
+
     def _create_screenshot_content(self) -> dict:
         """Create a screenshot content block for the API."""
         screenshot_b64 = self.screen.capture()
@@ -232,15 +354,85 @@ class ComputerUseAgent:
             "type": "image",
             "source": {
                 "type": "base64",
-                "media_type": "image/png",
+                "media_type": self.screen.media_type,
                 "data": screenshot_b64
             }
         }
 
+    def _trim_screenshots(self, messages: list[dict]) -> None:
+        """Replace all but the most recent screenshots in the conversation with a placeholder.
+
+        Keeps the request payload from growing with every iteration.
+        """
+        kept = 0
+        for message in reversed(messages):
+            if message["role"] != "user" or not isinstance(message["content"], list):
+                continue
+
+            # Screenshots sit either directly in the content or inside tool results
+            containers = [message["content"]] + [
+                block["content"] for block in message["content"]
+                if block.get("type") == "tool_result"
+            ]
+            for blocks in reversed(containers):
+                for i in range(len(blocks) - 1, -1, -1):
+                    if blocks[i].get("type") != "image":
+                        continue
+                    if kept < self.keep_screenshots:
+                        kept += 1
+                    else:
+                        blocks[i] = {"type": "text", "text": "[screenshot elided]"}
+
+    async def _run_tool_block(self, block, batch: "ToolBatch") -> None:
+        """Execute one tool_use block and add its tool_result to the batch.
+
+        Mutating actions start a fresh background screenshot, superseding any
+        earlier one in the batch; call _finish_batch to attach it. A superseded
+        capture is cancelled if it hasn't started, otherwise awaited, so it never
+        overlaps the next action.
+        """
+        action = block.input.get("action", "screenshot")
+        params = {k: v for k, v in block.input.items() if k != "action"}
+        mutating = action not in READ_ONLY_ACTIONS
+
+        print(f"Action: {action} | Params: {params}")
+        self.callback(action, params)
+
+        if mutating and batch.screenshot is not None and not batch.screenshot.cancel():
+            await asyncio.wrap_future(batch.screenshot)
+
+        # Execute the action off the event loop
+        result = await asyncio.to_thread(self.executor.execute, action, **params)
+        print(f"Result: {result}")
+
+        # Only re-capture when the screen may have changed
+        if mutating or batch.screenshot is None:
+            batch.screenshot = self._pool.submit(self._create_screenshot_content)
+
+        batch.tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": [{"type": "text", "text": result}]
+        })
+
+    @staticmethod
+    async def _finish_batch(batch: "ToolBatch") -> list[dict]:
+        """Attach the batch's final screenshot to its last tool_result and return the results.
+
+        Earlier results in the same turn would show the same screen, so only the
+        last one carries the image.
+        """
+        if batch.tool_results:
+            screenshot = await asyncio.wrap_future(batch.screenshot)
+            batch.tool_results[-1]["content"].append(screenshot)
+        return batch.tool_results
+
     def run(self, task: str, system_prompt: str | None = None) -> str:
         """
         Run a task using computer use.
 
+        Blocking wrapper around arun(); must not be called from a running event loop.
+
         Args:
             task: The task to accomplish (e.g., "Open notepad and type hello")
             system_prompt: Optional system prompt override
@@ -248,22 +440,28 @@ class ComputerUseAgent:
         Returns:
             Final text response from Claude
         """
-        default_system = """You are a computer use agent that can control a Windows desktop.
-You can see the screen through screenshots and interact using mouse and keyboard.
+        return asyncio.run(self.arun(task, system_prompt))
 
-Guidelines:
-- Take a screenshot first to see the current state
-- Use keyboard shortcuts when possible (e.g., Win+R for Run dialog)
-- Verify actions succeeded by taking screenshots
-- Be precise with click coordinates
-- Wait briefly after actions that trigger UI changes"""
+    async def arun(self, task: str, system_prompt: str | None = None) -> str:
+        """
+        Run a task using computer use (async).
+
+        Args:
+            task: The task to accomplish (e.g., "Open notepad and type hello")
+            system_prompt: Optional system prompt override
+
+        Returns:
+            Final text response from Claude
+        """
+        system = system_prompt or DEFAULT_SYSTEM_PROMPT
+        tools = [self._get_computer_tool()]
 
         messages = [
             {
                 "role": "user",
                 "content": [
                     {"type": "text", "text": task},
-                    self._create_screenshot_content()
+                    await asyncio.wrap_future(self._pool.submit(self._create_screenshot_content))
                 ]
             }
         ]
@@ -271,14 +469,21 @@ Guidelines:
         for iteration in range(self.max_iterations):
             print(f"\n--- Iteration {iteration + 1} ---")
 
-            response = self.client.beta.messages.create(
+            # Stream the response so each tool call runs as soon as its block
+            # is complete, while the model is still generating the rest
+            batch = ToolBatch()
+            async with self.aclient.beta.messages.stream(
                 model=self.model,
                 max_tokens=4096,
-                system=system_prompt or default_system,
-                tools=[self._get_computer_tool()],
+                system=system,
+                tools=tools,
                 messages=messages,
-                betas=[self.beta_flag]
-            )
+                betas=self._betas
+            ) as stream:
+                async for event in stream:
+                    if event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                        await self._run_tool_block(event.content_block, batch)
+                response = await stream.get_final_message()
 
             # Check if we're done
             if response.stop_reason == "end_turn":
@@ -288,39 +493,12 @@ Guidelines:
                         return block.text
                 return "Task completed"
 
-            # Process tool use
-            tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    action = block.input.get("action", "screenshot")
-                    params = {k: v for k, v in block.input.items() if k != "action"}
-
-                    print(f"Action: {action} | Params: {params}")
-                    self.callback(action, params)
-
-                    # Execute the action
-                    result = self.executor.execute(action, **params)
-                    print(f"Result: {result}")
-
-                    # Build tool result
-                    tool_result = {
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": []
-                    }
-
-                    # Always include a screenshot after actions
-                    tool_result["content"].append({
-                        "type": "text",
-                        "text": result
-                    })
-                    tool_result["content"].append(self._create_screenshot_content())
-
-                    tool_results.append(tool_result)
+            tool_results = await self._finish_batch(batch)
 
             # Add assistant response and tool results to messages
             messages.append({"role": "assistant", "content": response.content})
             messages.append({"role": "user", "content": tool_results})
+            self._trim_screenshots(messages)
 
         return "Max iterations reached"
 
@@ -13,32 +13,73 @@ Usage:
 """
 
 import argparse
+import atexit
 import base64
+import bisect
+import ctypes
+import functools
+import hashlib
 import io
 import os
 import sys
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.resources import TextResource
 
+# Screenshots are saved to disk for user inspection unless MCP_NO_PERSIST=1,
+# which keeps capture purely in memory for high-throughput agent loops
+PERSIST_SCREENSHOTS = os.environ.get("MCP_NO_PERSIST", "0") != "1"
+
 # Directory for saving screenshots - organized by session
 SCREENSHOTS_BASE = Path(__file__).parent / "screenshots"
-SCREENSHOTS_BASE.mkdir(exist_ok=True)
 
 # Generate unique session ID for this run
 SESSION_ID = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:6]
 SCREENSHOTS_DIR = SCREENSHOTS_BASE / SESSION_ID
-SCREENSHOTS_DIR.mkdir(exist_ok=True)
+if PERSIST_SCREENSHOTS:
+    SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Speculative pre-capture: while running (MCP_PRECAPTURE=1 at startup, or the
+# start_capture_stream tool), a background thread keeps grabbing the screen so
+# screenshot(), the OCR tools and describe_screen() can reuse a frame that is at
+# most 100 ms old
+PRECAPTURE_ENABLED = os.environ.get("MCP_PRECAPTURE", "0") == "1"
+PRECAPTURE_INTERVAL = 0.05
+PRECAPTURE_MAX_AGE = 0.1
+
+# Zoom regions bigger than this are still captured natively, but the caller is
+# nudged toward smaller regions (or screenshot()) since they cost a full encode
+ZOOM_MAX_PIXELS = 1920 * 1080
+
+# MCP_FAST_INPUT=1 sends clicks and cursor moves straight through SendInput
+# (Windows only), skipping pyautogui's per-call overhead and PAUSE sleep
+FAST_INPUT = os.environ.get("MCP_FAST_INPUT", "0") == "1"
+
+# MCP_PRELOAD_OCR=1 loads PaddleOCR in the background at startup instead of on
+# the first ocr_screen()/verify_text_on_screen() call
+PRELOAD_OCR = os.environ.get("MCP_PRELOAD_OCR", "0") == "1"
+
+# zlib level for screenshot PNGs - 1 is several times faster to encode than
+# optimize=True for ~20% larger files (override with MCP_PNG_LEVEL=0-9)
+PNG_COMPRESS_LEVEL = int(os.environ.get("MCP_PNG_LEVEL", "1"))
 
 # Only import GUI libraries if not just showing help
 if "--help" not in sys.argv and "-h" not in sys.argv:
     import mss
     import pyautogui
-    from PIL import Image, ImageOps, ImageFilter, ImageEnhance, ImageDraw
+    from PIL import Image, ImageChops, ImageFilter
+
+    import win_input
+
+    # Lossless WebP encodes faster and ~20% smaller than PNG for saved screenshots
+    _webp_available = ".webp" in Image.registered_extensions()
 
     # Safety settings
     pyautogui.FAILSAFE = True
@@ -49,7 +90,6 @@ if "--help" not in sys.argv and "-h" not in sys.argv:
         import win32gui
         import win32con
         import win32process
-        import subprocess
         _win32_available = True
     except ImportError as e:
         print(f"Warning: Win32 API not available: {e}")
@@ -79,6 +119,57 @@ if "--help" not in sys.argv and "-h" not in sys.argv:
 # Global state for enhance mode
 _enhance_enabled = False
 
+# mss instances, one per thread - mss 9.x-10.1 keeps its Windows GDI handles
+# thread-local, so an instance can only grab on the thread that made it. Each is
+# created on first use and rebuilt if the display changes; _sct_lock only guards
+# the registry used to close them all at exit.
+_sct_local = threading.local()
+_sct_instances = []
+_sct_lock = threading.Lock()
+
+# Primary monitor geometry - resolved once, cleared when an mss instance is reset
+_screen_info = None
+
+# Latest speculative grab as (monotonic start time, ScreenShot), and when the
+# last input tool finished - frames started before that are stale
+_latest_grab = None
+_last_input_time = 0.0
+_precapture_thread = None
+_precapture_stop = None
+
+# OCR results for recent frames, keyed by (hash of the raw capture, enhance flag),
+# so polling an unchanged screen skips the OCR entirely
+OCR_CACHE_SIZE = 16
+_ocr_cache = OrderedDict()
+
+# Last OCR'd frame as (enhance flag, unenhanced RGB image, regions). On the next
+# call only the area that changed since then is re-OCR'd, unless it covers more
+# than OCR_DIFF_MAX_FRACTION of the screen.
+OCR_DIFF_MAX_FRACTION = 0.5
+OCR_DIFF_MARGIN = 16
+_last_ocr_frame = None
+
+# Lowercased text of the last searched OCR result as (regions, corpus, starts):
+# every region's text joined by \x1f, with the corpus offset where each begins
+_ocr_text_index = None
+
+# describe_screen() captions keyed by a perceptual hash of the frame, so a screen
+# that only differs by a blinking caret or the clock reuses the last caption
+CAPTION_CACHE_SIZE = 8
+_caption_cache = OrderedDict()
+
+# Visible top-level windows as (monotonic time, [(hwnd, title, lowercased title)]),
+# shared by the window tools so back-to-back calls enumerate once
+WINDOW_CACHE_TTL = 0.2
+_window_cache = (0.0, [])
+
+# Most recent screenshot()/zoom() image, for get_last_screenshot_b64()
+_last_image = None
+
+# Screenshot files are written in the background so tools don't wait on disk.
+# A single worker keeps writes in capture order.
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-io")
+
 # Default florence availability (set in import block)
 if "--help" in sys.argv or "-h" in sys.argv:
     _florence_available = False
@@ -415,11 +506,9 @@ mcp.add_resource(TextResource(
 
 ## Basic Text Entry
 ```
-# Simple ASCII text
+# Any text, including unicode
 type_text("Hello World")
-
-# For unicode/special characters
-type_unicode("Hello 世界 🌍")
+type_text("Hello 世界 🌍")
 ```
 
 ## Keyboard Shortcuts
@@ -472,77 +561,350 @@ key("escape")     # Cancel/close
 ```
 
 ## Important Notes
-- `type_text()` is faster but ASCII-only
-- `type_unicode()` supports all characters but slower
+- `type_text()` sends the whole string at once and supports all characters
+- `type_unicode()` is kept as an alias of `type_text()`
 - Always focus the correct window before typing!
 """,
     tags={"workflow", "keyboard", "typing"}
 ))
 
 
+def _get_sct() -> "mss.base.MSSBase":
+    """Get the calling thread's mss instance, creating it on first use."""
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        sct = _sct_local.sct = mss.mss()
+        with _sct_lock:
+            _sct_instances.append(sct)
+    return sct
+
+
+def _release_sct():
+    """Close the calling thread's mss instance, if it has one."""
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        return
+    _sct_local.sct = None
+    with _sct_lock:
+        if sct in _sct_instances:
+            _sct_instances.remove(sct)
+    try:
+        sct.close()
+    except Exception:
+        pass
+
+
+def _reset_sct():
+    """Drop the calling thread's mss instance so its next use reconnects."""
+    invalidate_screen_info()
+    _release_sct()
+
+
+@atexit.register
+def _close_sct():
+    """Release every thread's mss instance at exit (best-effort off their own threads)."""
+    with _sct_lock:
+        instances = _sct_instances[:]
+        _sct_instances.clear()
+    for sct in instances:
+        try:
+            sct.close()
+        except Exception:
+            pass
+
+
+def grab_screen(region: dict = None):
+    """Grab the primary monitor, or a region of it, with this thread's mss instance.
+
+    Args:
+        region: Optional dict with absolute left, top, width, height
+
+    Returns:
+        mss ScreenShot
+    """
+    try:
+        sct = _get_sct()
+        return sct.grab(region or sct.monitors[1])
+    except mss.ScreenShotError:
+        # Display configuration may have changed - reconnect and retry once
+        _reset_sct()
+        sct = _get_sct()
+        return sct.grab(region or sct.monitors[1])
+
+
+def _precapture_loop(stop: threading.Event):
+    """Keep _latest_grab fresh until stop is set (runs on a daemon thread)."""
+    global _latest_grab
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                _latest_grab = (started, grab_screen())
+            except Exception:
+                _latest_grab = None
+            stop.wait(PRECAPTURE_INTERVAL)
+    finally:
+        # This thread's mss instance can't be closed from anywhere else
+        _release_sct()
+
+
+def start_precapture() -> bool:
+    """Start the pre-capture thread. Returns False if it was already running."""
+    global _precapture_thread, _precapture_stop
+    if _precapture_thread is not None and _precapture_thread.is_alive():
+        return False
+    _precapture_stop = threading.Event()
+    _precapture_thread = threading.Thread(
+        target=_precapture_loop, args=(_precapture_stop,), name="precapture", daemon=True
+    )
+    _precapture_thread.start()
+    return True
+
+
+def stop_precapture() -> bool:
+    """Stop the pre-capture thread. Returns False if it wasn't running."""
+    global _precapture_thread, _latest_grab
+    if _precapture_thread is None:
+        return False
+    _precapture_stop.set()
+    _precapture_thread = None
+    _latest_grab = None
+    return True
+
+
+def _invalidate_precapture():
+    """Discard any pre-captured frame taken before now."""
+    global _latest_grab, _last_input_time
+    _last_input_time = time.monotonic()
+    _latest_grab = None
+
+
+def _input_action(func):
+    """Mark pre-captured frames stale once an input tool has run."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _invalidate_precapture()
+    return wrapper
+
+
+def _click(x: int, y: int, button: str = "left", clicks: int = 1):
+    """Click via SendInput when FAST_INPUT is on, otherwise via pyautogui."""
+    if FAST_INPUT and win_input.AVAILABLE:
+        # Still honor the corner failsafe
+        pyautogui.failSafeCheck()
+        win_input.click(x, y, button, clicks)
+    else:
+        pyautogui.click(x, y, clicks=clicks, button=button)
+
+
+def _move_to(x: int, y: int):
+    """Move the cursor via SetCursorPos when FAST_INPUT is on, otherwise via pyautogui."""
+    if FAST_INPUT and win_input.AVAILABLE:
+        pyautogui.failSafeCheck()
+        win_input.move_to(x, y)
+    else:
+        pyautogui.moveTo(x, y)
+
+
+def grab_latest():
+    """Return the pre-captured frame if it is recent enough, else grab a fresh one."""
+    latest = _latest_grab
+    if latest is not None:
+        started, shot = latest
+        if started > _last_input_time and time.monotonic() - started < PRECAPTURE_MAX_AGE:
+            return shot
+    return grab_screen()
+
+
+def screenshot_to_image(screenshot, size: tuple = None,
+                        resample: int = None) -> "Image.Image":
+    """Convert an mss ScreenShot to an RGB image, optionally resizing it.
+
+    When resizing, the raw BGRA buffer is wrapped without copying (the resampler
+    doesn't care that the channels are mislabelled) and only the smaller result
+    is repacked to RGB.
+
+    Args:
+        screenshot: mss ScreenShot
+        size: Optional (width, height) to resize to
+        resample: PIL resampling filter. Default: an exact box reduce for
+            integer ratios (e.g. 3840 -> 1920), otherwise BILINEAR.
+
+    Returns:
+        RGB PIL Image
+    """
+    if size is None or tuple(size) == tuple(screenshot.size):
+        return Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
+
+    bgrx = Image.frombuffer("RGBX", screenshot.size, screenshot.raw, "raw", "RGBX", 0, 1)
+    factor = bgrx.width // size[0]
+    if resample is None and factor > 1 and (bgrx.width, bgrx.height) == (size[0] * factor, size[1] * factor):
+        small = bgrx.reduce(factor)
+    else:
+        small = bgrx.resize(size, resample if resample is not None else Image.Resampling.BILINEAR)
+
+    b, g, r, _ = small.split()
+    return Image.merge("RGB", (r, g, b))
+
+
+def invalidate_screen_info():
+    """Forget the cached monitor geometry (e.g. after a resolution change)."""
+    global _screen_info
+    _screen_info = None
+
+
 def get_screen_info() -> dict:
-    """Get information about the primary monitor."""
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]
-        return {
+    """Get information about the primary monitor (cached after the first call)."""
+    global _screen_info
+    info = _screen_info
+    if info is None:
+        monitor = _get_sct().monitors[1]
+        info = _screen_info = {
             "width": monitor["width"],
             "height": monitor["height"],
             "left": monitor["left"],
             "top": monitor["top"]
         }
+    return dict(info)
+
+
+def _autocontrast_lut(histogram: list, cutoff: float) -> list:
+    """Build the per-channel lookup table ImageOps.autocontrast(cutoff=...) would apply."""
+    lut = []
+    for layer in range(0, len(histogram), 256):
+        h = histogram[layer:layer + 256]
+        n = sum(h)
+
+        # Drop cutoff% of pixels from the dark end, then from the bright end
+        cut = int(n * cutoff // 100)
+        for lo in range(256):
+            if cut > h[lo]:
+                cut -= h[lo]
+                h[lo] = 0
+            else:
+                h[lo] -= cut
+                break
+        cut = int(n * cutoff // 100)
+        for hi in range(255, -1, -1):
+            if cut > h[hi]:
+                cut -= h[hi]
+                h[hi] = 0
+            else:
+                h[hi] -= cut
+                break
+
+        lo = next((i for i in range(256) if h[i]), 0)
+        hi = next((i for i in range(255, -1, -1) if h[i]), 255)
+        if hi <= lo:
+            lut.extend(range(256))
+        else:
+            scale = 255.0 / (hi - lo)
+            lut.extend(min(max(int(i * scale - lo * scale), 0), 255) for i in range(256))
+    return lut
 
 
-def apply_enhancement(img: "Image.Image") -> "Image.Image":
-    """Apply contrast enhancement pipeline to an image."""
+def apply_enhancement(img: "Image.Image", contrast: float = 1.3, saturation: float = 1.2) -> "Image.Image":
+    """Apply contrast enhancement pipeline to an RGB image.
+
+    Equivalent to autocontrast(cutoff=0.5) -> Contrast(1.3) -> SHARPEN -> Color(1.2),
+    with the point-wise steps fused so the image is traversed three times
+    instead of once per step.
+    """
+    histogram = img.histogram()
+
     # 1. Auto-contrast: stretches histogram to use full range
-    img = ImageOps.autocontrast(img, cutoff=0.5)
-    # 2. Boost contrast for extra punch
-    img = ImageEnhance.Contrast(img).enhance(1.3)
+    lut = _autocontrast_lut(histogram, cutoff=0.5)
+
+    # 2. Boost contrast around the mean gray of the stretched image - computed
+    #    from the histogram, then folded into the same lookup table
+    n = img.width * img.height
+    means = [
+        sum(histogram[c * 256 + i] * lut[c * 256 + i] for i in range(256)) / n
+        for c in range(3)
+    ]
+    mean = int(0.299 * means[0] + 0.587 * means[1] + 0.114 * means[2] + 0.5)
+    lut = [min(max(int(mean + contrast * (v - mean)), 0), 255) for v in lut]
+    img = img.point(lut)
+
     # 3. Sharpen to make edges and text crisper
     img = img.filter(ImageFilter.SHARPEN)
-    # 4. Slight saturation boost to make colors more distinct
-    img = ImageEnhance.Color(img).enhance(1.2)
-    return img
 
+    # 4. Slight saturation boost to make colors more distinct - blending each
+    #    pixel away from its own gray is a linear colour matrix
+    k = 1 - saturation
+    matrix = (
+        saturation + k * 0.299, k * 0.587, k * 0.114, 0,
+        k * 0.299, saturation + k * 0.587, k * 0.114, 0,
+        k * 0.299, k * 0.587, saturation + k * 0.114, 0,
+    )
+    return img.convert("RGB", matrix)
 
-def draw_cursor_marker(img: "Image.Image", x: int, y: int, scale: float = 1.0) -> "Image.Image":
-    """Draw a visible cursor marker on the image.
+
+def draw_cursor_marker(img: "Image.Image", draw_x: int, draw_y: int, size: int = 25) -> "Image.Image":
+    """Draw a bright green filled square at the cursor for maximum visibility.
 
     Args:
         img: PIL Image to draw on
-        x: Native screen X coordinate of cursor
-        y: Native screen Y coordinate of cursor
-        scale: Scale factor if image was resized (e.g., 0.5 if scaled to half)
+        draw_x: Cursor X coordinate in image space (already scaled)
+        draw_y: Cursor Y coordinate in image space (already scaled)
+        size: Half-width of the square in image pixels
 
     Returns:
-        Image with cursor marker drawn
+        The same image, modified in place, with the cursor marker drawn
+    """
+    # Solid fill of the clipped box (inclusive of the far edge, like ImageDraw.rectangle)
+    box = (
+        max(draw_x - size, 0),
+        max(draw_y - size, 0),
+        min(draw_x + size + 1, img.width),
+        min(draw_y + size + 1, img.height),
+    )
+    if box[0] < box[2] and box[1] < box[3]:
+        img.paste((0, 255, 0), box)  # Pure bright green
+
+    return img
+
+
+def encode_png(img: "Image.Image") -> memoryview:
+    """Encode an image as PNG.
+
+    Returns a view of the encoder's buffer rather than a bytes copy of it.
     """
-    # Adjust coordinates for scaling
-    draw_x = int(x * scale)
-    draw_y = int(y * scale)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getbuffer()
 
-    # Make a copy to draw on
-    img = img.copy()
-    draw = ImageDraw.Draw(img)
 
-    # Draw a bright green filled square for maximum visibility
-    size = int(25 * scale) if scale < 1 else 25
+def base64_preview(png_bytes: bytes, chars: int = 100) -> str:
+    """Describe the base64 form of png_bytes without encoding all of it.
 
-    # Bright green filled square - maximally visible
-    draw.rectangle(
-        [(draw_x - size, draw_y - size), (draw_x + size, draw_y + size)],
-        fill="#00FF00",  # Pure bright green
-        outline="#00FF00"
-    )
+    Only the first few bytes are encoded for the preview; the full length is
+    computed arithmetically.
+    """
+    preview = base64.standard_b64encode(png_bytes[:chars * 3 // 4]).decode("ascii")
+    total = (len(png_bytes) + 2) // 3 * 4
+    return f"Base64 PNG data: {preview}... (truncated, {total} chars total)"
 
-    return img
+
+def _report_write_error(future):
+    """Log a failed background screenshot write (stdout belongs to the MCP transport)."""
+    error = future.exception()
+    if error is not None:
+        print(f"Warning: failed to save screenshot: {error}", file=sys.stderr)
 
 
 def save_screenshot(img: "Image.Image", mode: str, enhanced: bool, region: dict = None) -> tuple:
-    """Save screenshot to disk and return the filename and relative path.
+    """Queue a screenshot for saving to disk and return the filename and relative path.
+
+    Saved as lossless WebP when Pillow supports it, otherwise as PNG. The encode
+    and write happen on a background thread; the returned path is final but the
+    file may appear a few milliseconds later, and img must not be modified afterwards.
 
     Args:
-        img: PIL Image to save
+        img: Image to save
         mode: 'full' or 'zoom'
         enhanced: Whether enhancement was applied
         region: For zoom mode, dict with x, y, width, height
@@ -552,20 +914,26 @@ def save_screenshot(img: "Image.Image", mode: str, enhanced: bool, region: dict
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
     enhance_suffix = "_enhanced" if enhanced else ""
+    ext = "webp" if _webp_available else "png"
 
     if mode == "zoom" and region:
-        filename = f"{timestamp}_zoom_{region['x']}x{region['y']}_{region['width']}x{region['height']}{enhance_suffix}.png"
+        filename = f"{timestamp}_zoom_{region['x']}x{region['y']}_{region['width']}x{region['height']}{enhance_suffix}.{ext}"
     else:
-        filename = f"{timestamp}_full{enhance_suffix}.png"
+        filename = f"{timestamp}_full{enhance_suffix}.{ext}"
 
     filepath = SCREENSHOTS_DIR / filename
-    img.save(filepath, format="PNG", optimize=True)
+    if _webp_available:
+        # quality is encoder effort in lossless mode; 0/0 is the fastest setting
+        future = _io_pool.submit(img.save, filepath, format="WEBP", lossless=True, quality=0, method=0)
+    else:
+        future = _io_pool.submit(img.save, filepath, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    future.add_done_callback(_report_write_error)
     relative_path = f"screenshots/{SESSION_ID}/{filename}"
     return (filename, relative_path)
 
 
 def capture_screenshot(max_dimension: int = 1920, force_enhance: bool = None, draw_cursor: bool = True) -> tuple:
-    """Capture screenshot and return image + base64 PNG.
+    """Capture screenshot and return the processed image.
 
     Args:
         max_dimension: Max width/height before scaling
@@ -573,7 +941,7 @@ def capture_screenshot(max_dimension: int = 1920, force_enhance: bool = None, dr
         draw_cursor: Whether to draw cursor marker on image
 
     Returns:
-        Tuple of (PIL Image, base64 string, enhanced bool)
+        Tuple of (PIL Image, enhanced bool)
     """
     global _enhance_enabled
     should_enhance = force_enhance if force_enhance is not None else _enhance_enabled
@@ -581,38 +949,37 @@ def capture_screenshot(max_dimension: int = 1920, force_enhance: bool = None, dr
     # Get cursor position before capturing
     cursor_pos = pyautogui.position()
 
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]
-        screenshot = sct.grab(monitor)
-        img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    screenshot = grab_latest()
+    width, height = screenshot.size
 
-        # Apply enhancement if enabled
-        if should_enhance:
-            img = apply_enhancement(img)
+    # Work out the downscale (if any)
+    scale = 1.0
+    new_size = None
+    max_actual = max(width, height)
+    if max_actual > max_dimension:
+        scale = max_dimension / max_actual
+        new_size = (int(width * scale), int(height * scale))
 
-        # Scale down if needed
-        scale = 1.0
-        max_actual = max(img.width, img.height)
-        if max_actual > max_dimension:
-            scale = max_dimension / max_actual
-            new_size = (int(img.width * scale), int(img.height * scale))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
+    # Resize straight from the raw buffer
+    img = screenshot_to_image(screenshot, new_size)
 
-        # Draw cursor marker
-        if draw_cursor:
-            img = draw_cursor_marker(img, cursor_pos.x, cursor_pos.y, scale)
+    # Apply enhancement if enabled - after downscaling, so it touches fewer pixels
+    if should_enhance:
+        img = apply_enhancement(img)
 
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True)
-        img_b64 = base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
-        return (img, img_b64, should_enhance)
+    # Draw cursor marker
+    if draw_cursor:
+        img = draw_cursor_marker(img, int(cursor_pos.x * scale), int(cursor_pos.y * scale),
+                                 max(4, int(25 * scale)))
+
+    return (img, should_enhance)
 
 
 @mcp.tool()
-def screenshot() -> str:
+def screenshot(return_base64: bool = False) -> str:
     """
     Take a screenshot of the current screen.
-    Returns base64-encoded PNG image data.
+    Returns the screen size and where the screenshot was saved.
 
     The image is scaled down for efficiency but coordinates map 1:1 to native screen.
     Use this for getting an overview of the screen state.
@@ -620,26 +987,38 @@ def screenshot() -> str:
 
     Note: If enhance mode is ON (via set_enhance_mode), contrast enhancement is applied.
     Screenshots are also saved to the screenshots/ directory for user inspection.
+
+    Args:
+        return_base64: Also PNG-encode the image and include a base64 preview.
+            Use get_last_screenshot_b64() to fetch the full data on demand.
     """
+    global _last_image
     try:
         screen = get_screen_info()
-        img, img_b64, enhanced = capture_screenshot()
+        img, enhanced = capture_screenshot()
+        _last_image = img
 
         # Save to disk for user inspection
-        filename, relative_path = save_screenshot(img, "full", enhanced)
+        if PERSIST_SCREENSHOTS:
+            filename, relative_path = save_screenshot(img, "full", enhanced)
+            saved = f"Saved: {relative_path}"
+        else:
+            saved = "Not saved (MCP_NO_PERSIST=1)"
 
         enhance_status = " [ENHANCED]" if enhanced else ""
-        return (
+        result = (
             f"Screenshot captured ({screen['width']}x{screen['height']}){enhance_status}.\n"
-            f"Saved: {relative_path}\n"
-            f"Base64 PNG data: {img_b64[:100]}... (truncated, {len(img_b64)} chars total)"
+            f"{saved}"
         )
+        if return_base64:
+            result += f"\n{base64_preview(encode_png(img))}"
+        return result
     except Exception as e:
         return f"Error capturing screenshot: {e}"
 
 
 @mcp.tool()
-def zoom(x: int, y: int, width: int, height: int) -> str:
+def zoom(x: int, y: int, width: int, height: int, return_base64: bool = False) -> str:
     """
     Capture a specific region of the screen at NATIVE resolution (no scaling).
 
@@ -653,6 +1032,7 @@ def zoom(x: int, y: int, width: int, height: int) -> str:
         y: Top edge of region (native screen pixels, 0 = top edge)
         width: Width of region to capture
         height: Height of region to capture
+        return_base64: Also PNG-encode the image and include a base64 preview
 
     COORDINATE MAPPING:
     The returned image shows exactly the region you requested at native resolution.
@@ -665,8 +1045,8 @@ def zoom(x: int, y: int, width: int, height: int) -> str:
     Note: If enhance mode is ON (via set_enhance_mode), contrast enhancement is applied.
     Screenshots are also saved to the screenshots/ directory for user inspection.
     """
+    global _enhance_enabled, _last_image
     try:
-        global _enhance_enabled
         screen = get_screen_info()
 
         # Clamp region to screen bounds
@@ -682,16 +1062,13 @@ def zoom(x: int, y: int, width: int, height: int) -> str:
         cursor_pos = pyautogui.position()
 
         # Capture the specific region
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]
-            region = {
-                "left": monitor["left"] + x,
-                "top": monitor["top"] + y,
-                "width": width,
-                "height": height
-            }
-            screenshot_data = sct.grab(region)
-            img = Image.frombytes("RGB", screenshot_data.size, screenshot_data.bgra, "raw", "BGRX")
+        region = {
+            "left": screen["left"] + x,
+            "top": screen["top"] + y,
+            "width": width,
+            "height": height
+        }
+        img = screenshot_to_image(grab_screen(region))
 
         # Apply enhancement if enabled
         if _enhance_enabled:
@@ -703,28 +1080,49 @@ def zoom(x: int, y: int, width: int, height: int) -> str:
             # Adjust cursor position to be relative to the region
             relative_cursor_x = cursor_pos.x - x
             relative_cursor_y = cursor_pos.y - y
-            img = draw_cursor_marker(img, relative_cursor_x, relative_cursor_y, scale=1.0)
+            img = draw_cursor_marker(img, relative_cursor_x, relative_cursor_y)
+        _last_image = img
 
         # Save to disk for user inspection
-        filename, relative_path = save_screenshot(img, "zoom", _enhance_enabled, {"x": x, "y": y, "width": width, "height": height})
-
-        # No scaling - return at native resolution
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True)
-        img_b64 = base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
+        if PERSIST_SCREENSHOTS:
+            filename, relative_path = save_screenshot(img, "zoom", _enhance_enabled, {"x": x, "y": y, "width": width, "height": height})
+            saved = f"Saved: {relative_path}"
+        else:
+            saved = "Not saved (MCP_NO_PERSIST=1)"
 
         enhance_status = " [ENHANCED]" if _enhance_enabled else ""
-        return (
+        size_hint = ""
+        if width * height > ZOOM_MAX_PIXELS:
+            size_hint = "Tip: this region is very large - zoom into a smaller area, or use screenshot() for an overview.\n"
+        result = (
             f"Zoomed region captured at native resolution{enhance_status}.\n"
             f"Region: x={x}, y={y}, width={width}, height={height}\n"
-            f"Saved: {relative_path}\n"
-            f"To click something at pixel (px, py) in this image, use: click({x} + px, {y} + py)\n"
-            f"Base64 PNG data: {img_b64[:100]}... (truncated, {len(img_b64)} chars total)"
+            f"{size_hint}"
+            f"{saved}\n"
+            f"To click something at pixel (px, py) in this image, use: click({x} + px, {y} + py)"
         )
+        if return_base64:
+            result += f"\n{base64_preview(encode_png(img))}"
+        return result
     except Exception as e:
         return f"Error capturing zoom region: {e}"
 
 
+@mcp.tool()
+def get_last_screenshot_b64() -> str:
+    """
+    Get the full base64-encoded PNG of the most recent screenshot() or zoom().
+
+    The image is kept in memory, so this works even with MCP_NO_PERSIST=1.
+    """
+    if _last_image is None:
+        return "Error: No screenshot taken yet"
+    try:
+        return base64.standard_b64encode(encode_png(_last_image)).decode("ascii")
+    except Exception as e:
+        return f"Error encoding screenshot: {e}"
+
+
 @mcp.tool()
 def set_enhance_mode(enabled: bool) -> str:
     """
@@ -763,6 +1161,32 @@ def set_enhance_mode(enabled: bool) -> str:
     return f"Enhance mode is now {status}. All subsequent screenshots and zooms will {'have' if enabled else 'NOT have'} contrast enhancement applied."
 
 
+@mcp.tool()
+def start_capture_stream() -> str:
+    """
+    Start grabbing the screen continuously in the background.
+
+    While the stream runs, screenshot(), ocr_screen(), verify_text_on_screen() and
+    describe_screen() reuse a frame that is at most 100 ms old (and newer than the
+    last mouse/keyboard action) instead of capturing on demand. It costs CPU the
+    whole time - call stop_capture_stream() after a burst of screenshots or a
+    verify polling loop.
+    """
+    if start_precapture():
+        return "Capture stream started"
+    return "Capture stream already running"
+
+
+@mcp.tool()
+def stop_capture_stream() -> str:
+    """
+    Stop the background capture stream started by start_capture_stream().
+    """
+    if stop_precapture():
+        return "Capture stream stopped"
+    return "Capture stream was not running"
+
+
 @mcp.tool()
 def get_screen_size() -> dict:
     """
@@ -773,6 +1197,7 @@ def get_screen_size() -> dict:
 
 
 @mcp.tool()
+@_input_action
 def left_click(x: int, y: int) -> str:
     """
     Perform a left mouse click at the specified coordinates.
@@ -785,13 +1210,14 @@ def left_click(x: int, y: int) -> str:
         y: Y coordinate (pixels from top edge)
     """
     try:
-        pyautogui.click(x, y)
+        _click(x, y)
         return f"Left clicked at ({x}, {y})"
     except Exception as e:
         return f"Error clicking: {e}"
 
 
 @mcp.tool()
+@_input_action
 def right_click(x: int, y: int) -> str:
     """
     Perform a right mouse click at the specified coordinates.
@@ -801,13 +1227,14 @@ def right_click(x: int, y: int) -> str:
         y: Y coordinate (pixels from top edge)
     """
     try:
-        pyautogui.rightClick(x, y)
+        _click(x, y, button="right")
         return f"Right clicked at ({x}, {y})"
     except Exception as e:
         return f"Error right-clicking: {e}"
 
 
 @mcp.tool()
+@_input_action
 def double_click(x: int, y: int) -> str:
     """
     Perform a double left click at the specified coordinates.
@@ -817,13 +1244,14 @@ def double_click(x: int, y: int) -> str:
         y: Y coordinate (pixels from top edge)
     """
     try:
-        pyautogui.doubleClick(x, y)
+        _click(x, y, clicks=2)
         return f"Double clicked at ({x}, {y})"
     except Exception as e:
         return f"Error double-clicking: {e}"
 
 
 @mcp.tool()
+@_input_action
 def mouse_move(x: int, y: int) -> str:
     """
     Move the mouse cursor to the specified coordinates.
@@ -833,13 +1261,14 @@ def mouse_move(x: int, y: int) -> str:
         y: Y coordinate (pixels from top edge)
     """
     try:
-        pyautogui.moveTo(x, y)
+        _move_to(x, y)
         return f"Moved mouse to ({x}, {y})"
     except Exception as e:
         return f"Error moving mouse: {e}"
 
 
 @mcp.tool()
+@_input_action
 def drag(start_x: int, start_y: int, end_x: int, end_y: int) -> str:
     """
     Click and drag from start coordinates to end coordinates.
@@ -859,38 +1288,52 @@ def drag(start_x: int, start_y: int, end_x: int, end_y: int) -> str:
 
 
 @mcp.tool()
-def type_text(text: str) -> str:
+@_input_action
+def type_text(text: str, interval_ms: int = 0) -> str:
     """
     Type the specified text using the keyboard.
-    Note: For special characters or non-ASCII, use key() instead.
+    On Windows the whole string is sent in one SendInput batch and may
+    contain any unicode characters.
 
     Args:
         text: The text to type
+        interval_ms: Delay between characters, for fields that drop fast input (default: 0)
     """
     try:
-        pyautogui.typewrite(text, interval=0.02)
+        if win_input.AVAILABLE:
+            pyautogui.failSafeCheck()
+            win_input.type_text(text, interval=interval_ms / 1000)
+        else:
+            pyautogui.typewrite(text, interval=interval_ms / 1000 if interval_ms else 0.02)
         return f"Typed: {text[:50]}{'...' if len(text) > 50 else ''}"
     except Exception as e:
         return f"Error typing: {e}"
 
 
 @mcp.tool()
-def type_unicode(text: str) -> str:
+@_input_action
+def type_unicode(text: str, interval_ms: int = 0) -> str:
     """
     Type text that may contain unicode/special characters.
-    Slower but supports all characters.
+    Same as type_text() on Windows; elsewhere slower but supports all characters.
 
     Args:
         text: The text to type (can include unicode)
+        interval_ms: Delay between characters (default: 0)
     """
     try:
-        pyautogui.write(text)
+        if win_input.AVAILABLE:
+            pyautogui.failSafeCheck()
+            win_input.type_text(text, interval=interval_ms / 1000)
+        else:
+            pyautogui.write(text, interval=interval_ms / 1000)
         return f"Typed (unicode): {text[:50]}{'...' if len(text) > 50 else ''}"
     except Exception as e:
         return f"Error typing unicode: {e}"
 
 
 @mcp.tool()
+@_input_action
 def key(keys: str) -> str:
     """
     Press a key or key combination.
@@ -918,6 +1361,7 @@ def key(keys: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def scroll(x: int, y: int, direction: str, amount: int = 3) -> str:
     """
     Scroll at the specified coordinates.
@@ -967,15 +1411,14 @@ def get_all_windows() -> str:
         return "Error: UI Automation not available. Install pywinauto: pip install pywinauto"
 
     try:
-        windows = _uia.get_all_windows()
+        # Tiny and off-screen windows are filtered out during enumeration
+        windows = _uia.get_visible_windows()
         if not windows:
             return "No windows found"
 
         result = ["Open Windows:"]
         for win in windows:
-            # Skip tiny windows or off-screen windows
-            if win.width > 50 and win.height > 50 and win.x >= -2000:
-                result.append(f"  - '{win.name[:60]}' at ({win.x}, {win.y}) size {win.width}x{win.height}")
+            result.append(f"  - '{win.name[:60]}' at ({win.x}, {win.y}) size {win.width}x{win.height}")
 
         return "\n".join(result)
     except Exception as e:
@@ -983,6 +1426,7 @@ def get_all_windows() -> str:
 
 
 @mcp.tool()
+@_input_action
 def find_and_click_window(title: str) -> str:
     """
     Find a window by title and click to focus it.
@@ -999,12 +1443,12 @@ def find_and_click_window(title: str) -> str:
         window = _uia.find_window(title_contains=title)
         if not window:
             # List available windows to help
-            windows = _uia.get_all_windows()
+            windows = _uia.get_visible_windows()
             titles = [w.name[:50] for w in windows if w.name]
             return f"Window with title containing '{title}' not found.\nAvailable windows: {titles}"
 
         # Click to focus
-        pyautogui.click(window.center_x, window.center_y)
+        _click(window.center_x, window.center_y)
         return f"Clicked on window '{window.name}' at ({window.center_x}, {window.center_y})"
 
     except Exception as e:
@@ -1024,10 +1468,8 @@ def get_ui_state() -> str:
 
     try:
         result = ["Open Windows:"]
-        windows = _uia.get_all_windows()
-        for win in windows:
-            if win.width > 50 and win.height > 50 and win.x >= -2000:
-                result.append(f"  '{win.name[:60]}' at ({win.x}, {win.y}) {win.width}x{win.height} -> click({win.center_x}, {win.center_y})")
+        for win in _uia.get_visible_windows():
+            result.append(f"  '{win.name[:60]}' at ({win.x}, {win.y}) {win.width}x{win.height} -> click({win.center_x}, {win.center_y})")
 
         return "\n".join(result)
 
@@ -1039,6 +1481,122 @@ def get_ui_state() -> str:
 # FLORENCE-2 VISION TOOLS - AI-powered screen understanding
 # =============================================================================
 
+def _poly_bounds(poly) -> tuple:
+    """(left, top, right, bottom) of an OCR bbox polygon."""
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _ocr_changed_area(img: "Image.Image", prev_img: "Image.Image", prev_regions: list,
+                      enhance: bool):
+    """Re-OCR only the part of img that differs from prev_img.
+
+    Returns the merged regions, or None if too much changed for this to pay off.
+    """
+    bbox = ImageChops.difference(img, prev_img).getbbox()
+    if bbox is None:
+        return prev_regions
+
+    # Grow the dirty box (plus a margin) until it swallows every cached region it
+    # touches, so text crossing its edge is re-read whole rather than cut in two
+    left = max(bbox[0] - OCR_DIFF_MARGIN, 0)
+    top = max(bbox[1] - OCR_DIFF_MARGIN, 0)
+    right = min(bbox[2] + OCR_DIFF_MARGIN, img.width)
+    bottom = min(bbox[3] + OCR_DIFF_MARGIN, img.height)
+    kept = list(prev_regions)
+    grew = True
+    while grew:
+        grew = False
+        still_kept = []
+        for r in kept:
+            rl, rt, rr, rb = _poly_bounds(r['bbox'])
+            if rr < left or rl > right or rb < top or rt > bottom:
+                still_kept.append(r)
+            else:
+                left, top = max(min(left, int(rl)), 0), max(min(top, int(rt)), 0)
+                right, bottom = min(max(right, int(rr) + 1), img.width), min(max(bottom, int(rb) + 1), img.height)
+                grew = True
+        kept = still_kept
+
+    if (right - left) * (bottom - top) > OCR_DIFF_MAX_FRACTION * img.width * img.height:
+        return None
+
+    # Enhance the whole frame so the crop gets the same tone curve as a full OCR would
+    source = apply_enhancement(img) if enhance else img
+    fresh = florence_vision.ocr_with_regions(source.crop((left, top, right, bottom)))
+    for r in fresh:
+        r['bbox'] = [[p[0] + left, p[1] + top] for p in r['bbox']]
+
+    merged = kept + fresh
+    merged.sort(key=lambda r: (r['bbox'][0][1], r['bbox'][0][0]))
+    return merged
+
+
+def ocr_screen_regions(enhance: bool) -> list:
+    """Capture the screen and OCR it, reusing cached results for identical frames.
+
+    Args:
+        enhance: Apply contrast enhancement before OCR
+
+    Returns:
+        florence_vision.ocr_with_regions() regions, in native screen coordinates
+    """
+    global _last_ocr_frame
+    shot = grab_latest()
+    # Hashing the raw buffer costs ~20 ms at 4K (SHA-1 is the fastest hashlib
+    # digest on typical CPUs); OCR costs hundreds
+    key = (hashlib.sha1(shot.raw).digest(), enhance)
+    regions = _ocr_cache.get(key)
+    if regions is not None:
+        _ocr_cache.move_to_end(key)
+        return regions
+
+    img = screenshot_to_image(shot)
+    regions = None
+    prev = _last_ocr_frame
+    if prev is not None and prev[0] == enhance and prev[1].size == img.size:
+        regions = _ocr_changed_area(img, prev[1], prev[2], enhance)
+    if regions is None:
+        if enhance:
+            regions = florence_vision.ocr_with_regions(apply_enhancement(img))
+        else:
+            # Slice the raw BGRA buffer rather than converting img back to an array
+            regions = florence_vision.ocr_with_regions(florence_vision.screenshot_array(shot))
+    _last_ocr_frame = (enhance, img, regions)
+
+    _ocr_cache[key] = regions
+    if len(_ocr_cache) > OCR_CACHE_SIZE:
+        _ocr_cache.popitem(last=False)
+    return regions
+
+
+def find_ocr_text(regions: list, text: str):
+    """First OCR region containing text (case-insensitive), or None.
+
+    Searches one joined lowercase corpus per OCR result with a single str.find
+    instead of scanning every region; the corpus is rebuilt only when regions
+    changes (cached results come back as the same list).
+    """
+    global _ocr_text_index
+    if not regions:
+        return None
+    if _ocr_text_index is None or _ocr_text_index[0] is not regions:
+        lowered = [r['text'].lower() for r in regions]
+        starts = []
+        offset = 0
+        for t in lowered:
+            starts.append(offset)
+            offset += len(t) + 1
+        _ocr_text_index = (regions, "\x1f".join(lowered), starts)
+
+    _, corpus, starts = _ocr_text_index
+    index = corpus.find(text.lower())
+    if index < 0:
+        return None
+    return regions[bisect.bisect_right(starts, index) - 1]
+
+
 @mcp.tool()
 def ocr_screen() -> str:
     """
@@ -1063,26 +1621,17 @@ def ocr_screen() -> str:
         return "Error: Vision module not available. Check that the venv is active and dependencies are installed."
 
     try:
-        # Capture screen at full resolution for accurate coordinates
-        img = florence_vision.capture_screen()
-
-        # Apply enhancement if enabled (helps with low-contrast text)
-        if _enhance_enabled:
-            img = apply_enhancement(img)
-
-        # Run OCR with regions to get coordinates
-        regions = florence_vision.ocr_with_regions(img)
+        # Capture at full resolution for accurate coordinates and run OCR with
+        # regions; enhancement (if enabled) helps with low-contrast text
+        regions = ocr_screen_regions(_enhance_enabled)
 
         if not regions:
             return "OCR Result: No text detected on screen"
 
         # Format output with click coordinates
         result = ["OCR Result (text -> click coordinates):"]
-        for r in regions:
-            bbox = r['bbox']
-            # Calculate center point for clicking
-            center_x = int((bbox[0][0] + bbox[2][0]) / 2)
-            center_y = int((bbox[0][1] + bbox[2][1]) / 2)
+        centers = florence_vision.region_centers(regions).tolist()
+        for r, (center_x, center_y) in zip(regions, centers):
             text = r['text']
             result.append(f"  '{text}' -> click({center_x}, {center_y})")
 
@@ -1091,6 +1640,17 @@ def ocr_screen() -> str:
         return f"Error performing OCR: {e}"
 
 
+def _dhash(img: "Image.Image", size: int = 16) -> bytes:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a small grayscale copy."""
+    small = img.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR).tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (small[offset + col] < small[offset + col + 1])
+    return bits.to_bytes(size * size // 8, "big")
+
+
 @mcp.tool()
 def describe_screen() -> str:
     """
@@ -1106,12 +1666,20 @@ def describe_screen() -> str:
         return "Error: Florence-2 vision not available. Check that the venv is active and dependencies are installed."
 
     try:
-        # Capture screen
-        img = florence_vision.capture_screen()
-        img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-
-        # Get detailed caption
-        description = florence_vision.detailed_caption(img)
+        # Capture screen, resized straight from the raw buffer to Florence-2's
+        # input size so its processor doesn't resample a second time
+        img = screenshot_to_image(grab_latest(), florence_vision.FLORENCE_INPUT_SIZE)
+
+        # Get detailed caption, unless a near-identical screen was just described
+        key = _dhash(img)
+        description = _caption_cache.get(key)
+        if description is None:
+            description = florence_vision.detailed_caption(img)
+            _caption_cache[key] = description
+            if len(_caption_cache) > CAPTION_CACHE_SIZE:
+                _caption_cache.popitem(last=False)
+        else:
+            _caption_cache.move_to_end(key)
         return f"Screen Description:\n{description}"
     except Exception as e:
         return f"Error describing screen: {e}"
@@ -1137,23 +1705,16 @@ def verify_text_on_screen(expected_text: str) -> str:
         return "Error: Vision module not available. Check that the venv is active."
 
     try:
-        # Capture screen at full resolution
-        img = florence_vision.capture_screen()
-
-        # Apply enhancement if enabled
-        if _enhance_enabled:
-            img = apply_enhancement(img)
-
-        # Run OCR with regions
-        regions = florence_vision.ocr_with_regions(img)
+        # Capture screen at full resolution and run OCR with regions
+        regions = ocr_screen_regions(_enhance_enabled)
 
         # Search for expected text (case-insensitive)
-        for r in regions:
-            if expected_text.lower() in r['text'].lower():
-                bbox = r['bbox']
-                center_x = int((bbox[0][0] + bbox[2][0]) / 2)
-                center_y = int((bbox[0][1] + bbox[2][1]) / 2)
-                return f"FOUND: '{r['text']}' -> click({center_x}, {center_y})"
+        r = find_ocr_text(regions, expected_text)
+        if r is not None:
+            bbox = r['bbox']
+            center_x = int((bbox[0][0] + bbox[2][0]) / 2)
+            center_y = int((bbox[0][1] + bbox[2][1]) / 2)
+            return f"FOUND: '{r['text']}' -> click({center_x}, {center_y})"
 
         # Not found - show what was detected
         all_text = [r['text'] for r in regions[:10]]
@@ -1167,7 +1728,44 @@ def verify_text_on_screen(expected_text: str) -> str:
 # WINDOWS INTEGRATION - Win32 API for proper window control
 # =============================================================================
 
+def _find_window(title: str):
+    """Find the first visible window whose title contains title (case-insensitive).
+
+    Enumerates at most once per WINDOW_CACHE_TTL across all window tools.
+
+    Returns:
+        (hwnd, window_title), or None if no window matches
+    """
+    global _window_cache
+    stamp, windows = _window_cache
+    if time.monotonic() - stamp >= WINDOW_CACHE_TTL:
+        windows = []
+
+        def callback(hwnd, _):
+            if win32gui.IsWindowVisible(hwnd):
+                window_title = win32gui.GetWindowText(hwnd)
+                windows.append((hwnd, window_title, window_title.lower()))
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        _window_cache = (time.monotonic(), windows)
+
+    needle = title.lower()
+    for hwnd, window_title, lowered in windows:
+        # A cached handle may belong to a window that has since closed
+        if needle in lowered and win32gui.IsWindow(hwnd):
+            return (hwnd, window_title)
+    return None
+
+
+def _invalidate_window_cache():
+    """Force the next _find_window() to re-enumerate."""
+    global _window_cache
+    _window_cache = (0.0, [])
+
+
 @mcp.tool()
+@_input_action
 def close_window(title: str) -> str:
     """
     Close a window by title using Win32 API.
@@ -1183,21 +1781,13 @@ def close_window(title: str) -> str:
         return "Error: Win32 API not available"
 
     try:
-        def callback(hwnd, results):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if title.lower() in window_title.lower():
-                    results.append((hwnd, window_title))
-            return True
-
-        results = []
-        win32gui.EnumWindows(callback, results)
-
-        if not results:
+        match = _find_window(title)
+        if match is None:
             return f"No window found containing '{title}'"
 
-        hwnd, window_title = results[0]
+        hwnd, window_title = match
         win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+        _invalidate_window_cache()
         return f"Sent close message to '{window_title}'"
 
     except Exception as e:
@@ -1205,6 +1795,7 @@ def close_window(title: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def focus_window(title: str) -> str:
     """
     Bring a window to the foreground by title.
@@ -1219,20 +1810,11 @@ def focus_window(title: str) -> str:
         return "Error: Win32 API not available"
 
     try:
-        def callback(hwnd, results):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if title.lower() in window_title.lower():
-                    results.append((hwnd, window_title))
-            return True
-
-        results = []
-        win32gui.EnumWindows(callback, results)
-
-        if not results:
+        match = _find_window(title)
+        if match is None:
             return f"No window found containing '{title}'"
 
-        hwnd, window_title = results[0]
+        hwnd, window_title = match
         win32gui.SetForegroundWindow(hwnd)
         return f"Focused '{window_title}'"
 
@@ -1241,6 +1823,7 @@ def focus_window(title: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def minimize_window(title: str) -> str:
     """
     Minimize a window by title.
@@ -1252,20 +1835,11 @@ def minimize_window(title: str) -> str:
         return "Error: Win32 API not available"
 
     try:
-        def callback(hwnd, results):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if title.lower() in window_title.lower():
-                    results.append((hwnd, window_title))
-            return True
-
-        results = []
-        win32gui.EnumWindows(callback, results)
-
-        if not results:
+        match = _find_window(title)
+        if match is None:
             return f"No window found containing '{title}'"
 
-        hwnd, window_title = results[0]
+        hwnd, window_title = match
         win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
         return f"Minimized '{window_title}'"
 
@@ -1274,6 +1848,7 @@ def minimize_window(title: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def maximize_window(title: str) -> str:
     """
     Maximize a window by title.
@@ -1285,20 +1860,11 @@ def maximize_window(title: str) -> str:
         return "Error: Win32 API not available"
 
     try:
-        def callback(hwnd, results):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if title.lower() in window_title.lower():
-                    results.append((hwnd, window_title))
-            return True
-
-        results = []
-        win32gui.EnumWindows(callback, results)
-
-        if not results:
+        match = _find_window(title)
+        if match is None:
             return f"No window found containing '{title}'"
 
-        hwnd, window_title = results[0]
+        hwnd, window_title = match
         win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
         return f"Maximized '{window_title}'"
 
@@ -1307,6 +1873,7 @@ def maximize_window(title: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def launch_app(app_name: str) -> str:
     """
     Launch an application using Windows Search/Start menu.
@@ -1317,20 +1884,15 @@ def launch_app(app_name: str) -> str:
     Uses Windows search to find and launch the app.
     """
     try:
-        # Use PowerShell Start-Process which handles app resolution
-        result = subprocess.run(
-            ["powershell", "-Command", f"Start-Process '{app_name}'"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
+        # ShellExecute resolves App Paths, PATH and file associations the same way
+        # Start-Process does, without paying for a PowerShell startup per launch
+        result = ctypes.windll.shell32.ShellExecuteW(None, "open", app_name, None, None, 1)  # SW_SHOWNORMAL
+        if result > 32:
             return f"Launched '{app_name}'"
-        else:
-            # Try shell execute as fallback
-            os.startfile(app_name)
-            return f"Launched '{app_name}' via shell"
+
+        # Try shell execute as fallback (raises FileNotFoundError if nothing matches)
+        os.startfile(app_name)
+        return f"Launched '{app_name}' via shell"
 
     except FileNotFoundError:
         return f"App '{app_name}' not found. Try the full path or exact name."
@@ -1339,6 +1901,7 @@ def launch_app(app_name: str) -> str:
 
 
 @mcp.tool()
+@_input_action
 def windows_search(query: str) -> str:
     """
     Open Windows Search and type a query.
@@ -1349,12 +1912,20 @@ def windows_search(query: str) -> str:
     Opens the Start menu search and types the query.
     """
     try:
-        # Press Windows key to open Start/Search
-        pyautogui.press('win')
-        time.sleep(0.3)
+        if win_input.AVAILABLE:
+            pyautogui.failSafeCheck()
+            # Press Windows key, then wait only until Start/Search takes the foreground
+            previous = win_input.foreground_window()
+            pyautogui.press('win')
+            win_input.wait_for_foreground_change(previous, timeout=0.3)
+            win_input.type_text(query)
+        else:
+            # Press Windows key to open Start/Search
+            pyautogui.press('win')
+            time.sleep(0.3)
 
-        # Type the search query
-        pyautogui.typewrite(query, interval=0.02)
+            # Type the search query
+            pyautogui.typewrite(query, interval=0.02)
 
         return f"Opened Windows search with query: '{query}'. Press Enter to select first result."
 
@@ -1382,6 +1953,12 @@ def main():
         mcp.settings.host = "127.0.0.1"
         mcp.settings.port = args.port
 
+    if PRECAPTURE_ENABLED:
+        start_precapture()
+
+    if PRELOAD_OCR and _florence_available:
+        florence_vision.preload_paddle_ocr()
+
     mcp.run(transport=args.transport)
 
 
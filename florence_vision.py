@@ -8,49 +8,124 @@ Requirements:
     - PyTorch with CUDA
     - transformers, timm, einops (for Florence-2)
     - paddleocr (for OCR)
+    - bitsandbytes (only for FLORENCE_PRECISION=int8)
 """
 
+import os
+import threading
+
 import torch
 from PIL import Image
 from typing import Optional
 import mss
 import numpy as np
 
+# Florence-2's processor resizes every image to exactly this (ignoring aspect
+# ratio); callers that downscale first should target it to avoid a second resample
+FLORENCE_INPUT_SIZE = (768, 768)
+
+# Florence-2 weight precision: fp16 (default), bf16 (Ampere+, falls back to fp16),
+# fp32, or int8 (8-bit language-model Linear layers via bitsandbytes - roughly
+# halves decoder VRAM, activations and the vision encoder stay fp16)
+FLORENCE_PRECISION = os.environ.get("FLORENCE_PRECISION", "fp16").lower()
+_PRECISION_DTYPES = {
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+    "fp32": torch.float32,
+    "int8": torch.float16,
+}
+
+# Compile the image encoder with torch.compile. Off by default: it needs Triton
+# (not shipped for Windows by default) and the first call pays for compilation.
+FLORENCE_COMPILE = os.environ.get("FLORENCE_COMPILE", "0") == "1"
+
 # Lazy load models to save memory
 _florence_model = None
 _florence_processor = None
+_florence_dtype = None
 _paddle_ocr = None
+_paddle_lock = threading.Lock()
 
 
 def load_paddle_ocr():
-    """Load PaddleOCR (lazy loading)."""
+    """Load PaddleOCR (lazy loading, safe to call from several threads)."""
     global _paddle_ocr
 
     if _paddle_ocr is None:
-        print("Loading PaddleOCR...")
-        from paddleocr import PaddleOCR
-        _paddle_ocr = PaddleOCR(lang='en')
-        print("PaddleOCR loaded!")
+        with _paddle_lock:
+            if _paddle_ocr is None:
+                print("Loading PaddleOCR...")
+                from paddleocr import PaddleOCR
+                _paddle_ocr = PaddleOCR(lang='en')
+                print("PaddleOCR loaded!")
 
     return _paddle_ocr
 
 
+def preload_paddle_ocr() -> threading.Thread:
+    """Start loading PaddleOCR on a background thread so the first OCR call doesn't pay for it."""
+    thread = threading.Thread(target=load_paddle_ocr, name="paddleocr-preload", daemon=True)
+    thread.start()
+    return thread
+
+
 def load_florence():
     """Load Florence-2 model (lazy loading)."""
-    global _florence_model, _florence_processor
+    global _florence_model, _florence_processor, _florence_dtype
 
     if _florence_model is None:
-        print("Loading Florence-2 model...")
+        if FLORENCE_PRECISION not in _PRECISION_DTYPES:
+            raise ValueError(f"FLORENCE_PRECISION must be one of {sorted(_PRECISION_DTYPES)}, got {FLORENCE_PRECISION!r}")
+
+        print(f"Loading Florence-2 model ({FLORENCE_PRECISION})...")
         from transformers import AutoProcessor, AutoModelForCausalLM
 
         model_id = "microsoft/Florence-2-large"
+        dtype = _PRECISION_DTYPES[FLORENCE_PRECISION]
+        if dtype is torch.bfloat16 and not torch.cuda.is_bf16_supported():
+            print("bf16 not supported on this GPU, using fp16")
+            dtype = torch.float16
 
         _florence_processor = AutoProcessor.from_pretrained(model_id, trust_remote_code=True)
-        _florence_model = AutoModelForCausalLM.from_pretrained(
-            model_id,
-            trust_remote_code=True,
-            torch_dtype=torch.float16
-        ).to("cuda")
+        if FLORENCE_PRECISION == "int8":
+            from transformers import BitsAndBytesConfig
+            # Quantized weights are placed on the GPU at load and can't be moved with .to().
+            # The vision encoder runs once per image and is compute-bound, so it
+            # stays fp16; only the bandwidth-bound language model is quantized.
+            # An explicit skip list replaces transformers' default, so lm_head
+            # has to be listed too to stay unquantized.
+            _florence_model = AutoModelForCausalLM.from_pretrained(
+                model_id,
+                trust_remote_code=True,
+                torch_dtype=dtype,
+                quantization_config=BitsAndBytesConfig(
+                    load_in_8bit=True,
+                    llm_int8_skip_modules=["vision_tower", "lm_head"]
+                ),
+                device_map="cuda"
+            )
+        else:
+            _florence_model = AutoModelForCausalLM.from_pretrained(
+                model_id,
+                trust_remote_code=True,
+                torch_dtype=dtype
+            ).to("cuda")
+        _florence_dtype = dtype
+
+        if FLORENCE_COMPILE:
+            # The encoder always sees FLORENCE_INPUT_SIZE pixels, so its shapes are
+            # static and CUDA graphs apply; the decoder's growing sequence isn't.
+            # generate() calls self._encode_image, so shadowing it on the instance
+            # routes every call through the compiled version.
+            _florence_model._encode_image = torch.compile(
+                _florence_model._encode_image, mode="reduce-overhead", fullgraph=False
+            )
+            print("Compiling Florence-2 image encoder...")
+            warmup = _florence_processor(
+                text="<CAPTION>", images=Image.new("RGB", FLORENCE_INPUT_SIZE), return_tensors="pt"
+            ).to("cuda", dtype)
+            with torch.no_grad():
+                _florence_model._encode_image(warmup["pixel_values"])
 
         print("Florence-2 loaded!")
 
@@ -62,7 +137,7 @@ def run_florence(image: Image.Image, task: str, text_input: str = "") -> str:
     model, processor = load_florence()
 
     prompt = task if not text_input else f"{task} {text_input}"
-    inputs = processor(text=prompt, images=image, return_tensors="pt").to("cuda", torch.float16)
+    inputs = processor(text=prompt, images=image, return_tensors="pt").to("cuda", _florence_dtype)
 
     with torch.no_grad():
         generated_ids = model.generate(
@@ -83,6 +158,13 @@ def run_florence(image: Image.Image, task: str, text_input: str = "") -> str:
     return result
 
 
+def _paddle_input(image: "Image.Image | np.ndarray") -> np.ndarray:
+    """PaddleOCR input in BGR: arrays are assumed BGR already, PIL images are flipped."""
+    if isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image.convert('RGB'))[:, :, ::-1]
+
+
 def ocr_screenshot(image: Image.Image) -> str:
     """Extract all text from screenshot using PaddleOCR.
 
@@ -90,42 +172,44 @@ def ocr_screenshot(image: Image.Image) -> str:
     """
     ocr = load_paddle_ocr()
 
-    # Convert PIL Image to numpy array
-    img_array = np.array(image)
-
     # Run OCR using new predict API
-    result = ocr.predict(img_array)
+    result = ocr.predict(_paddle_input(image))
 
     if not result:
         return ""
 
-    # Extract text with positions for sorting
-    text_items = []
+    # Collect texts and their top-left corners for sorting
+    all_texts = []
+    corners = []
     for item in result:
         if 'rec_texts' in item and 'rec_polys' in item:
-            texts = item['rec_texts']
-            polys = item['rec_polys']
-            for text, poly in zip(texts, polys):
-                # poly is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                y_pos = poly[0][1]
-                x_pos = poly[0][0]
-                text_items.append((y_pos, x_pos, text))
+            all_texts.extend(item['rec_texts'])
+            # poly is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+            corners.extend(poly[0] for poly in item['rec_polys'])
 
-    # Sort by y position (top to bottom), then x position (left to right)
-    text_items.sort(key=lambda x: (x[0] // 30, x[1]))  # Group by ~30px rows
+    if not all_texts:
+        return ""
+
+    # Sort by y position (top to bottom, grouped into ~30px rows), then x
+    # position (left to right), in one stable C-level sort
+    corners = np.asarray(corners)
+    order = np.lexsort((corners[:, 0], corners[:, 1] // 30))
 
     # Join text
-    return ' '.join(item[2] for item in text_items)
+    return ' '.join(all_texts[i] for i in order)
 
 
-def ocr_with_regions(image: Image.Image) -> list:
+def ocr_with_regions(image: "Image.Image | np.ndarray") -> list:
     """Extract text with bounding box regions using PaddleOCR.
 
+    Accepts a PIL image (RGB) or an (H, W, 3) uint8 BGR array such as
+    screenshot_array() returns. PIL input is flipped to BGR so every caller
+    feeds PaddleOCR the same channel order.
+
     Returns list of dicts with 'text', 'bbox', 'confidence'.
     """
     ocr = load_paddle_ocr()
-    img_array = np.array(image)
-    result = ocr.predict(img_array)
+    result = ocr.predict(_paddle_input(image))
 
     if not result:
         return []
@@ -133,19 +217,37 @@ def ocr_with_regions(image: Image.Image) -> list:
     regions = []
     for item in result:
         if 'rec_texts' in item and 'rec_polys' in item and 'rec_scores' in item:
-            texts = item['rec_texts']
-            polys = item['rec_polys']
-            scores = item['rec_scores']
-            for text, poly, score in zip(texts, polys, scores):
-                regions.append({
-                    'text': text,
-                    'confidence': score,
-                    'bbox': poly
-                })
+            regions.extend(
+                {'text': text, 'confidence': score, 'bbox': poly}
+                for text, poly, score in zip(item['rec_texts'], item['rec_polys'], item['rec_scores'])
+            )
 
     return regions
 
 
+def screenshot_array(screenshot) -> np.ndarray:
+    """(H, W, 3) BGR view of an mss ScreenShot's raw buffer.
+
+    Drops the alpha channel by slicing rather than building a PIL image, so no
+    RGB conversion is done here. The view is strided (4 bytes per pixel), so
+    PaddleOCR may still make its own contiguous copy. BGR is the channel order
+    ocr_with_regions() uses for all input.
+    """
+    bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+    return bgra[:, :, :3]
+
+
+def region_centers(regions: list) -> np.ndarray:
+    """Click points for OCR regions: midpoint of each bbox's first and third corners.
+
+    Returns an (N, 2) int array of (x, y), computed in one vectorized pass.
+    """
+    if not regions:
+        return np.empty((0, 2), dtype=np.int32)
+    polys = np.asarray([r['bbox'] for r in regions], dtype=np.float32)
+    return polys[:, [0, 2]].mean(axis=1).astype(np.int32)
+
+
 def caption_screenshot(image: Image.Image) -> str:
     """Get a caption/description of the screenshot using Florence-2."""
     result = run_florence(image, "<CAPTION>")
@@ -170,12 +272,19 @@ def caption_to_grounding(image: Image.Image, caption: str) -> dict:
     return result.get("<CAPTION_TO_PHRASE_GROUNDING>", {})
 
 
+_sct = None
+_sct_lock = threading.Lock()
+
+
 def capture_screen() -> Image.Image:
     """Capture the current screen."""
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]
-        screenshot = sct.grab(monitor)
-        return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    global _sct
+
+    with _sct_lock:
+        if _sct is None:
+            _sct = mss.mss()
+        screenshot = _sct.grab(_sct.monitors[1])
+    return Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
 
 
 # ============================================================================
@@ -208,7 +317,7 @@ def test_florence():
 
     print("\nCapturing screen...")
     img = capture_screen()
-    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    img.thumbnail((1024, 1024), Image.Resampling.BILINEAR)
     print(f"Resized to: {img.size}")
 
     print("\n--- Caption ---")
@@ -0,0 +1,66 @@
+"""Tests for the computer use agent's conversation handling."""
+
+import pytest
+
+agent_module = pytest.importorskip("computer_use_agent")
+
+ELIDED = {"type": "text", "text": "[screenshot elided]"}
+
+
+def _image(n: int) -> dict:
+    return {"type": "image", "source": {"type": "base64", "media_type": "image/jpeg", "data": str(n)}}
+
+
+def _tool_result(n: int) -> dict:
+    return {
+        "type": "tool_result",
+        "tool_use_id": f"tool_{n}",
+        "content": [{"type": "text", "text": "ok"}, _image(n)]
+    }
+
+
+def _conversation() -> list[dict]:
+    return [
+        {"role": "user", "content": [{"type": "text", "text": "task"}, _image(0)]},
+        {"role": "assistant", "content": "thinking"},
+        {"role": "user", "content": [_tool_result(1)]},
+        {"role": "assistant", "content": [{"type": "text", "text": "next"}]},
+        {"role": "user", "content": [_tool_result(2), _tool_result(3)]},
+    ]
+
+
+def _images(messages: list[dict]) -> list[str]:
+    found = []
+    for message in messages:
+        if not isinstance(message["content"], list):
+            continue
+        for block in message["content"]:
+            blocks = block["content"] if block.get("type") == "tool_result" else [block]
+            found.extend(b["source"]["data"] for b in blocks if b.get("type") == "image")
+    return found
+
+
+def _agent(keep: int):
+    agent = agent_module.ComputerUseAgent.__new__(agent_module.ComputerUseAgent)
+    agent.keep_screenshots = keep
+    return agent
+
+
+@pytest.mark.parametrize("keep, remaining", [(0, []), (2, ["2", "3"]), (3, ["1", "2", "3"]), (10, ["0", "1", "2", "3"])])
+def test_trim_screenshots_keeps_most_recent(keep, remaining):
+    messages = _conversation()
+
+    _agent(keep)._trim_screenshots(messages)
+
+    assert _images(messages) == remaining
+
+
+def test_trim_screenshots_leaves_placeholders():
+    messages = _conversation()
+
+    _agent(1)._trim_screenshots(messages)
+
+    assert messages[0]["content"] == [{"type": "text", "text": "task"}, ELIDED]
+    assert messages[2]["content"][0]["content"] == [{"type": "text", "text": "ok"}, ELIDED]
+    assert messages[1]["content"] == "thinking"
+    assert _images(messages) == ["3"]
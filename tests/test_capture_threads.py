@@ -0,0 +1,89 @@
+"""Tests for per-thread screen capture in the MCP server."""
+
+import threading
+import time
+
+import pytest
+
+cu = pytest.importorskip("computer_use_mcp")
+
+
+class ThreadAffineMSS:
+    """Stand-in for mss 9.x-10.1 on Windows, whose GDI handles live in the creating thread's locals."""
+
+    monitors = [{}, {"left": 0, "top": 0, "width": 8, "height": 6}]
+
+    def __init__(self):
+        self._handles = threading.local()
+        self._handles.srcdc = object()
+        self.closed = False
+
+    def grab(self, monitor):
+        # Raises AttributeError off the creating thread, like mss does
+        self._handles.srcdc
+        return ("shot", threading.get_ident())
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def affine_mss(monkeypatch):
+    monkeypatch.setattr(cu.mss, "mss", ThreadAffineMSS)
+    monkeypatch.setattr(cu, "_sct_local", threading.local())
+    monkeypatch.setattr(cu, "_sct_instances", [])
+    monkeypatch.setattr(cu, "_latest_grab", None)
+    yield
+    cu.stop_precapture()
+
+
+def _wait_for_frame(timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while cu._latest_grab is None:
+        assert time.monotonic() < deadline, "precapture thread produced no frame"
+        time.sleep(0.01)
+    return cu._latest_grab
+
+
+def test_grab_screen_from_two_threads(affine_mss):
+    results = []
+    worker = threading.Thread(target=lambda: results.append(cu.grab_screen()))
+
+    main_shot = cu.grab_screen()
+    worker.start()
+    worker.join()
+
+    assert main_shot == ("shot", threading.get_ident())
+    assert results == [("shot", worker.ident)]
+    assert len(cu._sct_instances) == 2
+
+
+def test_capture_stream_started_mid_session(affine_mss):
+    # A tool call has already made the main thread's instance
+    cu.grab_screen()
+
+    assert cu.start_capture_stream() == "Capture stream started"
+    thread = cu._precapture_thread
+    _, shot = _wait_for_frame()
+    assert shot == ("shot", thread.ident)
+
+    assert cu.stop_capture_stream() == "Capture stream stopped"
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+    # The stream thread closes its own instance; the main thread's stays
+    assert len(cu._sct_instances) == 1
+
+
+def test_grab_latest_uses_stream_frame_until_input(affine_mss, monkeypatch):
+    monkeypatch.setattr(cu, "PRECAPTURE_MAX_AGE", 60.0)
+    monkeypatch.setattr(cu, "_last_input_time", 0.0)
+    cu.start_precapture()
+    thread = cu._precapture_thread
+    _wait_for_frame()
+
+    # OCR and describe_screen read frames through grab_latest on the tool thread
+    assert cu.grab_latest() == ("shot", thread.ident)
+
+    cu.stop_precapture()
+    cu._invalidate_precapture()
+    assert cu.grab_latest() == ("shot", threading.get_ident())
@@ -0,0 +1,91 @@
+"""Tests for the MCP server's pure-Python image and text helpers."""
+
+import base64
+import random
+import re
+
+import pytest
+
+cu = pytest.importorskip("computer_use_mcp")
+
+from PIL import Image, ImageChops, ImageEnhance, ImageFilter, ImageOps
+
+
+def _noise_image(width: int = 96, height: int = 64, seed: int = 0) -> Image.Image:
+    """Low-contrast RGB noise over a horizontal gradient."""
+    rng = random.Random(seed)
+    data = bytearray()
+    for y in range(height):
+        for x in range(width):
+            base = 60 + x * 100 // width
+            data += bytes(min(255, base + rng.randrange(-25, 26)) for _ in range(3))
+    return Image.frombytes("RGB", (width, height), bytes(data))
+
+
+def _four_step_enhancement(img: Image.Image) -> Image.Image:
+    """The original unfused enhancement pipeline."""
+    img = ImageOps.autocontrast(img, cutoff=0.5)
+    img = ImageEnhance.Contrast(img).enhance(1.3)
+    img = img.filter(ImageFilter.SHARPEN)
+    return ImageEnhance.Color(img).enhance(1.2)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_apply_enhancement_matches_four_step_pipeline(seed):
+    img = _noise_image(seed=seed)
+
+    diff = ImageChops.difference(cu.apply_enhancement(img), _four_step_enhancement(img))
+
+    assert max(hi for _, hi in diff.getextrema()) <= 1
+
+
+def test_autocontrast_lut_matches_imageops():
+    img = _noise_image()
+
+    fused = img.point(cu._autocontrast_lut(img.histogram(), cutoff=0.5))
+
+    assert fused.tobytes() == ImageOps.autocontrast(img, cutoff=0.5).tobytes()
+
+
+def _regions(*texts):
+    return [{'text': t, 'bbox': [[i, 0], [i + 1, 0], [i + 1, 1], [i, 1]]} for i, t in enumerate(texts)]
+
+
+def _regex_search(regions, text):
+    """The original per-region case-insensitive search."""
+    pattern = re.compile(re.escape(text), re.IGNORECASE)
+    return next((r for r in regions if pattern.search(r['text'])), None)
+
+
+@pytest.mark.parametrize("query", ["file", "FILE", "Edit", "ave a", "s", "(1)", "help", "it S", ""])
+def test_find_ocr_text_matches_regex_search(monkeypatch, query):
+    monkeypatch.setattr(cu, "_ocr_text_index", None)
+    regions = _regions("File", "Edit", "Save As", "Untitled (1)", "View", "Edit Settings")
+
+    assert cu.find_ocr_text(regions, query) is _regex_search(regions, query)
+
+
+def test_find_ocr_text_does_not_match_across_regions(monkeypatch):
+    monkeypatch.setattr(cu, "_ocr_text_index", None)
+
+    assert cu.find_ocr_text(_regions("Sa", "ve"), "save") is None
+
+
+def test_find_ocr_text_rebuilds_for_new_results(monkeypatch):
+    monkeypatch.setattr(cu, "_ocr_text_index", None)
+    first = _regions("Open")
+    second = _regions("Close")
+
+    assert cu.find_ocr_text(first, "open") is first[0]
+    assert cu.find_ocr_text(second, "open") is None
+    assert cu.find_ocr_text(second, "close") is second[0]
+    assert cu.find_ocr_text([], "close") is None
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 74, 75, 76, 77, 1000, 1001])
+def test_base64_preview_matches_full_encode(length):
+    data = bytes(random.Random(length).randrange(256) for _ in range(length))
+    full = base64.standard_b64encode(data).decode("ascii")
+
+    expected = f"Base64 PNG data: {full[:100]}... (truncated, {len(full)} chars total)"
+    assert cu.base64_preview(data) == expected
@@ -0,0 +1,43 @@
+"""Tests for vision_tools' pure-Python helpers."""
+
+import random
+
+import pytest
+
+import vision_tools
+
+# _quad_bounds imports numpy lazily
+pytest.importorskip("numpy")
+
+
+def _reference_bounds(quad):
+    """The original per-box min/max, with int() truncation."""
+    xs, ys = [p[0] for p in quad], [p[1] for p in quad]
+    return int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
+
+
+def _random_quads(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [[[rng.uniform(-50.0, 2000.0), rng.uniform(-50.0, 1200.0)] for _ in range(4)] for _ in range(count)]
+
+
+def test_quad_bounds_matches_per_box_min_max():
+    quads = _random_quads(50)
+
+    x1s, y1s, x2s, y2s = vision_tools._quad_bounds(quads)
+
+    assert list(zip(x1s, y1s, x2s, y2s)) == [_reference_bounds(q) for q in quads]
+    assert all(type(v) is int for v in x1s + y1s + x2s + y2s)
+
+
+def test_quad_bounds_accepts_flat_quads():
+    quads = _random_quads(10, seed=1)
+    flat = [[coord for point in quad for coord in point] for quad in quads]
+
+    assert vision_tools._quad_bounds(flat) == vision_tools._quad_bounds(quads)
+
+
+def test_quad_bounds_integer_boxes():
+    quad = [[10, 20], [110, 20], [110, 45], [10, 45]]
+
+    assert vision_tools._quad_bounds([quad]) == ([10], [20], [110], [45])
@@ -0,0 +1,43 @@
+"""Tests for building SendInput keyboard events (no input is sent)."""
+
+import win_input
+
+
+def _keys(text: str) -> list[tuple]:
+    return [
+        (event.type, event.ki.wVk, event.ki.wScan, event.ki.dwFlags)
+        for event in win_input._key_events(text)
+    ]
+
+
+def test_ascii_is_sent_as_unicode_down_up_pairs():
+    unicode_down = win_input.KEYEVENTF_UNICODE
+    unicode_up = win_input.KEYEVENTF_UNICODE | win_input.KEYEVENTF_KEYUP
+
+    assert _keys("Hi") == [
+        (win_input.INPUT_KEYBOARD, 0, ord("H"), unicode_down),
+        (win_input.INPUT_KEYBOARD, 0, ord("H"), unicode_up),
+        (win_input.INPUT_KEYBOARD, 0, ord("i"), unicode_down),
+        (win_input.INPUT_KEYBOARD, 0, ord("i"), unicode_up),
+    ]
+
+
+def test_newline_and_tab_use_virtual_keys():
+    assert _keys("\n\t") == [
+        (win_input.INPUT_KEYBOARD, win_input.VK_RETURN, 0, 0),
+        (win_input.INPUT_KEYBOARD, win_input.VK_RETURN, 0, win_input.KEYEVENTF_KEYUP),
+        (win_input.INPUT_KEYBOARD, win_input.VK_TAB, 0, 0),
+        (win_input.INPUT_KEYBOARD, win_input.VK_TAB, 0, win_input.KEYEVENTF_KEYUP),
+    ]
+
+
+def test_astral_characters_are_sent_as_surrogate_pairs():
+    scans = [scan for _, _, scan, _ in _keys("\U0001F600")]
+
+    # Each UTF-16 code unit gets its own down/up pair
+    assert scans == [0xD83D, 0xD83D, 0xDE00, 0xDE00]
+
+
+def test_bmp_characters_are_single_code_units():
+    assert [scan for _, _, scan, _ in _keys("é€")] == [0xE9, 0xE9, 0x20AC, 0x20AC]
+    assert _keys("") == []
@@ -12,12 +12,21 @@ Requirements:
 
 For Florence-2 (optional, for visual grounding):
     pip install transformers accelerate
+
+For faster screen capture on Windows (optional, DXGI Desktop Duplication):
+    pip install dxcam
 """
 
+import ctypes
+import hashlib
 import io
 import json
+import re
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
 
@@ -26,6 +35,8 @@ _pywinauto_available = False
 _easyocr_available = False
 _florence_available = False
 _mss_available = False
+_dxcam_available = False
+_win32_available = False
 
 try:
     import mss
@@ -34,14 +45,29 @@ try:
 except ImportError:
     pass
 
+try:
+    # DXGI Desktop Duplication capture (Windows only) - much faster than GDI BitBlt
+    import dxcam
+    _dxcam_available = True
+except ImportError:
+    pass
+
 try:
     from pywinauto import Desktop, Application
     from pywinauto.findwindows import ElementNotFoundError
+    from pywinauto.uia_defines import IUIA
     import pywinauto.controls.uia_controls
     _pywinauto_available = True
 except ImportError:
     pass
 
+try:
+    import win32con
+    import win32gui
+    _win32_available = True
+except ImportError:
+    pass
+
 try:
     import easyocr
     _easyocr_available = True
@@ -56,7 +82,76 @@ except ImportError:
     pass
 
 
-@dataclass
+# UIA PropertyConditionFlags
+_PROPERTY_CONDITION_IGNORE_CASE = 0x1
+_PROPERTY_CONDITION_MATCH_SUBSTRING = 0x2
+
+
+# DwmGetWindowAttribute attribute: nonzero when DWM hides the window
+_DWMWA_CLOAKED = 14
+
+
+def _is_cloaked(hwnd: int) -> bool:
+    """Whether DWM has cloaked a window (suspended UWP frames, other virtual desktops)."""
+    cloaked = ctypes.c_uint32(0)
+    try:
+        ctypes.windll.dwmapi.DwmGetWindowAttribute(
+            hwnd, _DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked)
+        )
+    except (AttributeError, OSError):
+        return False
+    return cloaked.value != 0
+
+
+def _quad_bounds(quads) -> Tuple[list, list, list, list]:
+    """Axis-aligned bounds of N four-point boxes, computed in one vectorized pass.
+
+    Args:
+        quads: N boxes as [[x,y] * 4] or flat [x,y] * 4 sequences
+
+    Returns:
+        (x1, y1, x2, y2) lists of ints (truncated like int())
+    """
+    import numpy as np
+
+    points = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    lo = points.min(axis=1).astype(np.int64)
+    hi = points.max(axis=1).astype(np.int64)
+    return lo[:, 0].tolist(), lo[:, 1].tolist(), hi[:, 0].tolist(), hi[:, 1].tolist()
+
+
+def _clamp_region(region: Tuple[int, int, int, int], width: int, height: int) -> Tuple[int, int, int, int]:
+    """Clip a (left, top, width, height) region to a width x height screen.
+
+    Returns:
+        (left, top, right, bottom) box
+    """
+    left, top, w, h = region
+    right, bottom = min(left + w, width), min(top + h, height)
+    left, top = max(left, 0), max(top, 0)
+    if right <= left or bottom <= top:
+        raise ValueError(f"Region {region} is outside the {width}x{height} screen")
+    return left, top, right, bottom
+
+
+def _offset_elements(elements: List["UIElement"], dx: int, dy: int) -> List["UIElement"]:
+    """Shift elements found in a cropped image back into screen coordinates (in place)."""
+    if dx or dy:
+        for e in elements:
+            e.x += dx
+            e.y += dy
+            e.center_x += dx
+            e.center_y += dy
+    return elements
+
+
+@lru_cache(maxsize=256)
+def _title_re(title_contains: str) -> "re.Pattern":
+    """Compiled case-insensitive 'title contains' pattern for pywinauto's title_re."""
+    return re.compile(f".*{re.escape(title_contains)}.*", re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class UIElement:
     """Represents a UI element found on screen."""
     name: str
@@ -71,10 +166,28 @@ class UIElement:
     source: str = "unknown"  # "uia", "ocr", "florence", "template"
     extra: Dict[str, Any] = None
 
+    @classmethod
+    def from_rect(cls, name: str, element_type: str, x: int, y: int, width: int, height: int,
+                  **kwargs) -> "UIElement":
+        """Build an element from its bounding rectangle, deriving the center point."""
+        return cls(name, element_type, x, y, width, height,
+                   x + width // 2, y + height // 2, **kwargs)
+
     def to_dict(self) -> dict:
-        d = asdict(self)
-        if d['extra'] is None:
-            del d['extra']
+        d = {
+            "name": self.name,
+            "element_type": self.element_type,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "center_x": self.center_x,
+            "center_y": self.center_y,
+            "confidence": self.confidence,
+            "source": self.source,
+        }
+        if self.extra is not None:
+            d["extra"] = self.extra
         return d
 
     def __str__(self):
@@ -87,33 +200,160 @@ class WindowsUIAutomation:
     This is the most reliable way to find elements - no vision needed.
     """
 
+    # get_all_windows()/get_taskbar_apps() results are reused for this long, so
+    # polling loops ("is Terminal open yet?") don't re-enumerate on every call
+    ENUM_CACHE_TTL = 0.5
+
     def __init__(self):
         if not _pywinauto_available:
             raise ImportError("pywinauto not installed. Run: pip install pywinauto")
         self.desktop = Desktop(backend="uia")
+        self._taskbar = None
+        self._windows_cache = (0.0, [])
+        self._taskbar_cache = (0.0, [])
+
+        # Prefetch the properties we read for every element, so a whole search
+        # comes back in one cross-process call instead of one call per property
+        self._iuia = IUIA()
+        ids = self._iuia.UIA_dll
+        self._cache_request = self._iuia.iuia.CreateCacheRequest()
+        for property_id in (ids.UIA_NamePropertyId, ids.UIA_ControlTypePropertyId,
+                            ids.UIA_BoundingRectanglePropertyId, ids.UIA_IsOffscreenPropertyId):
+            self._cache_request.AddProperty(property_id)
+
+    def _find_all_cached(self, root, scope: str, control_type: str = None,
+                         name_contains: str = None,
+                         visible_only: bool = False) -> List[Tuple[str, str, int, int, int, int]]:
+        """Find elements under a raw IUIAutomationElement with their properties prefetched.
+
+        Args:
+            root: IUIAutomationElement to search from
+            scope: "children" or "descendants"
+            control_type: Only match this control type (e.g. "Button"), filtered by UIA itself
+            name_contains: Only match names containing this (case-insensitive),
+                filtered by UIA itself (Windows 10 1809+)
+            visible_only: Skip elements UIA reports as offscreen
+
+        Returns:
+            List of (name, control_type, left, top, width, height)
+        """
+        iuia = self._iuia
+        conditions = []
+        if control_type:
+            conditions.append(iuia.iuia.CreatePropertyCondition(
+                iuia.UIA_dll.UIA_ControlTypePropertyId, iuia.known_control_types[control_type]
+            ))
+        if name_contains:
+            conditions.append(iuia.iuia.CreatePropertyConditionEx(
+                iuia.UIA_dll.UIA_NamePropertyId, name_contains,
+                _PROPERTY_CONDITION_IGNORE_CASE | _PROPERTY_CONDITION_MATCH_SUBSTRING
+            ))
+
+        if not conditions:
+            condition = iuia.true_condition
+        elif len(conditions) == 1:
+            condition = conditions[0]
+        else:
+            condition = iuia.iuia.CreateAndCondition(*conditions)
+
+        found = root.FindAllBuildCache(iuia.tree_scope[scope], condition, self._cache_request)
+        results = []
+        for i in range(found.Length):
+            elem = found.GetElement(i)
+            if visible_only and elem.CachedIsOffscreen:
+                continue
+            rect = elem.CachedBoundingRectangle
+            results.append((
+                elem.CachedName,
+                iuia.known_control_type_ids.get(elem.CachedControlType, "Unknown"),
+                rect.left,
+                rect.top,
+                rect.right - rect.left,
+                rect.bottom - rect.top,
+            ))
+        return results
+
+    def _get_taskbar(self):
+        """The taskbar window, connecting to explorer.exe only on first use."""
+        if self._taskbar is None:
+            explorer = Application(backend="uia").connect(path="explorer.exe")
+            self._taskbar = explorer.window(class_name="Shell_TrayWnd")
+        return self._taskbar
+
+    def invalidate_cache(self):
+        """Force the next get_all_windows()/get_taskbar_apps() to re-enumerate."""
+        self._windows_cache = (0.0, [])
+        self._taskbar_cache = (0.0, [])
 
     def get_all_windows(self) -> List[UIElement]:
-        """Get all visible windows."""
+        """Get all visible windows (cached for ENUM_CACHE_TTL seconds)."""
+        stamp, cached = self._windows_cache
+        if time.monotonic() - stamp < self.ENUM_CACHE_TTL:
+            return list(cached)
+
         windows = []
         try:
-            for win in self.desktop.windows():
-                try:
-                    rect = win.rectangle()
-                    windows.append(UIElement(
-                        name=win.window_text() or "Untitled",
-                        element_type="Window",
-                        x=rect.left,
-                        y=rect.top,
-                        width=rect.width(),
-                        height=rect.height(),
-                        center_x=rect.left + rect.width() // 2,
-                        center_y=rect.top + rect.height() // 2,
-                        source="uia"
-                    ))
-                except Exception:
-                    continue
+            # Top-level windows are the desktop root's children
+            for name, _, left, top, width, height in self._find_all_cached(
+                    self._iuia.root, "children", visible_only=True):
+                windows.append(UIElement.from_rect(
+                    name=name or "Untitled",
+                    element_type="Window",
+                    x=left,
+                    y=top,
+                    width=width,
+                    height=height,
+                    source="uia"
+                ))
         except Exception as e:
             print(f"Error getting windows: {e}")
+        self._windows_cache = (time.monotonic(), windows)
+        return list(windows)
+
+    def get_visible_windows(self, min_w: int = 50, min_h: int = 50, min_x: int = -2000) -> List[UIElement]:
+        """Get visible top-level windows, skipping tiny and parked off-screen ones.
+
+        Uses EnumWindows + GetWindowRect when pywin32 is available - one cheap
+        syscall per window instead of UIA COM round trips - and falls back to
+        filtering get_all_windows() otherwise. Untitled, tool and DWM-cloaked
+        windows are skipped, matching what desktop.windows() used to list.
+        """
+        if not _win32_available:
+            return [
+                w for w in self.get_all_windows()
+                if w.width > min_w and w.height > min_h and w.x >= min_x
+            ]
+
+        windows = []
+
+        def callback(hwnd, _):
+            if not win32gui.IsWindowVisible(hwnd):
+                return True
+            title = win32gui.GetWindowText(hwnd)
+            if not title:
+                return True
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOOLWINDOW:
+                return True
+            if _is_cloaked(hwnd):
+                return True
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+            width, height = right - left, bottom - top
+            if width > min_w and height > min_h and left >= min_x:
+                windows.append(UIElement.from_rect(
+                    name=title,
+                    element_type="Window",
+                    x=left,
+                    y=top,
+                    width=width,
+                    height=height,
+                    source="win32"
+                ))
+            return True
+
+        try:
+            win32gui.EnumWindows(callback, None)
+        except Exception as e:
+            print(f"Error enumerating windows: {e}")
         return windows
 
     def find_window(self, title_contains: str = None, class_name: str = None) -> Optional[UIElement]:
@@ -121,21 +361,19 @@ class WindowsUIAutomation:
         try:
             kwargs = {}
             if title_contains:
-                kwargs['title_re'] = f".*{title_contains}.*"
+                kwargs['title_re'] = _title_re(title_contains)
             if class_name:
                 kwargs['class_name'] = class_name
 
             win = self.desktop.window(**kwargs)
             rect = win.rectangle()
-            return UIElement(
+            return UIElement.from_rect(
                 name=win.window_text() or "Untitled",
                 element_type="Window",
                 x=rect.left,
                 y=rect.top,
                 width=rect.width(),
                 height=rect.height(),
-                center_x=rect.left + rect.width() // 2,
-                center_y=rect.top + rect.height() // 2,
                 source="uia"
             )
         except ElementNotFoundError:
@@ -145,80 +383,115 @@ class WindowsUIAutomation:
             return None
 
     def get_taskbar_apps(self) -> List[UIElement]:
-        """Get all running apps shown in the taskbar."""
+        """Get all running apps shown in the taskbar (cached for ENUM_CACHE_TTL seconds)."""
+        stamp, cached = self._taskbar_cache
+        if time.monotonic() - stamp < self.ENUM_CACHE_TTL:
+            return list(cached)
+
         apps = []
         try:
-            # Connect to explorer for taskbar access
-            explorer = Application(backend="uia").connect(path="explorer.exe")
-            taskbar = explorer.window(class_name="Shell_TrayWnd")
+            taskbar = self._get_taskbar()
 
             # Try to find the running apps area
             # Windows 11 structure
+            running_apps_failed = False
             try:
                 # Running applications pane
                 running_apps = taskbar.child_window(auto_id="TaskListThumbnailWnd", control_type="Pane")
-                for btn in running_apps.children(control_type="Button"):
-                    try:
-                        rect = btn.rectangle()
-                        name = btn.window_text() or "Unknown App"
-                        apps.append(UIElement(
-                            name=name,
-                            element_type="TaskbarButton",
-                            x=rect.left,
-                            y=rect.top,
-                            width=rect.width(),
-                            height=rect.height(),
-                            center_x=rect.left + rect.width() // 2,
-                            center_y=rect.top + rect.height() // 2,
-                            source="uia"
-                        ))
-                    except Exception:
-                        continue
+                root = running_apps.wrapper_object().element_info.element
+                for name, _, left, top, width, height in self._find_all_cached(root, "children", "Button"):
+                    apps.append(UIElement.from_rect(
+                        name=name or "Unknown App",
+                        element_type="TaskbarButton",
+                        x=left,
+                        y=top,
+                        width=width,
+                        height=height,
+                        source="uia"
+                    ))
             except Exception:
-                pass
+                running_apps_failed = True
 
             # Alternative: try to get all buttons in taskbar
             if not apps:
                 try:
-                    for btn in taskbar.descendants(control_type="Button"):
-                        try:
-                            rect = btn.rectangle()
-                            name = btn.window_text()
-                            if name and rect.width() > 20:  # Filter out tiny buttons
-                                apps.append(UIElement(
-                                    name=name,
-                                    element_type="TaskbarButton",
-                                    x=rect.left,
-                                    y=rect.top,
-                                    width=rect.width(),
-                                    height=rect.height(),
-                                    center_x=rect.left + rect.width() // 2,
-                                    center_y=rect.top + rect.height() // 2,
-                                    source="uia"
-                                ))
-                        except Exception:
-                            continue
+                    root = taskbar.wrapper_object().element_info.element
+                    for name, _, left, top, width, height in self._find_all_cached(root, "descendants", "Button"):
+                        if name and width > 20:  # Filter out tiny buttons
+                            apps.append(UIElement.from_rect(
+                                name=name,
+                                element_type="TaskbarButton",
+                                x=left,
+                                y=top,
+                                width=width,
+                                height=height,
+                                source="uia"
+                            ))
                 except Exception:
-                    pass
+                    if running_apps_failed:
+                        # Neither lookup worked - the connection is likely dead
+                        raise
 
         except Exception as e:
+            # explorer.exe may have restarted - reconnect next time, and don't
+            # cache the failure
+            self._taskbar = None
             print(f"Error getting taskbar apps: {e}")
+            return []
+
+        self._taskbar_cache = (time.monotonic(), apps)
+        return list(apps)
+
+    def _match_taskbar_buttons(self, app_name: str) -> Optional[List[UIElement]]:
+        """Taskbar buttons whose name contains app_name, filtered inside UIA.
+
+        Returns None if the filtered search isn't supported (older Windows).
+        """
+        try:
+            root = self._get_taskbar().wrapper_object().element_info.element
+            matches = self._find_all_cached(root, "descendants", "Button", name_contains=app_name)
+        except Exception:
+            # The connection may be dead (explorer.exe restarted) - reconnect next time
+            self._taskbar = None
+            return None
 
-        return apps
+        return [
+            UIElement.from_rect(
+                name=name,
+                element_type="TaskbarButton",
+                x=left,
+                y=top,
+                width=width,
+                height=height,
+                source="uia"
+            )
+            for name, _, left, top, width, height in matches
+            if width > 20  # Filter out tiny buttons
+        ]
 
     def find_taskbar_app(self, app_name: str) -> Optional[UIElement]:
         """Find a specific app in the taskbar by name."""
-        apps = self.get_taskbar_apps()
+        stamp, cached = self._taskbar_cache
+        if time.monotonic() - stamp < self.ENUM_CACHE_TTL:
+            apps = list(cached)
+        else:
+            # Let UIA return only the matching buttons instead of enumerating
+            # every button; fall back to the full enumeration if that fails
+            apps = self._match_taskbar_buttons(app_name)
+            if apps is None:
+                apps = self.get_taskbar_apps()
+
         app_name_lower = app_name.lower()
+        names = [app.name.lower() for app in apps]
 
         # First try exact match
-        for app in apps:
-            if app_name_lower == app.name.lower():
+        for app, name in zip(apps, names):
+            if app_name_lower == name:
                 return app
 
         # Then try contains match
-        for app in apps:
-            if app_name_lower in app.name.lower():
+        for app, name in zip(apps, names):
+            if app_name_lower in name:
                 return app
 
         return None
@@ -227,28 +500,20 @@ class WindowsUIAutomation:
         """Get all elements in a specific window."""
         elements = []
         try:
-            win = self.desktop.window(title_re=f".*{window_title}.*")
-
-            control_type = element_type if element_type else None
-            descendants = win.descendants(control_type=control_type) if control_type else win.descendants()
-
-            for elem in descendants:
-                try:
-                    rect = elem.rectangle()
-                    if rect.width() > 0 and rect.height() > 0:
-                        elements.append(UIElement(
-                            name=elem.window_text() or "",
-                            element_type=elem.element_info.control_type or "Unknown",
-                            x=rect.left,
-                            y=rect.top,
-                            width=rect.width(),
-                            height=rect.height(),
-                            center_x=rect.left + rect.width() // 2,
-                            center_y=rect.top + rect.height() // 2,
-                            source="uia"
-                        ))
-                except Exception:
-                    continue
+            win = self.desktop.window(title_re=_title_re(window_title))
+            root = win.wrapper_object().element_info.element
+
+            for name, control_type, left, top, width, height in self._find_all_cached(root, "descendants", element_type):
+                if width > 0 and height > 0:
+                    elements.append(UIElement.from_rect(
+                        name=name or "",
+                        element_type=control_type,
+                        x=left,
+                        y=top,
+                        width=width,
+                        height=height,
+                        source="uia"
+                    ))
         except Exception as e:
             print(f"Error getting window elements: {e}")
 
@@ -257,9 +522,7 @@ class WindowsUIAutomation:
     def dump_taskbar_tree(self) -> str:
         """Debug: Dump the taskbar UI tree structure."""
         try:
-            explorer = Application(backend="uia").connect(path="explorer.exe")
-            taskbar = explorer.window(class_name="Shell_TrayWnd")
-            return taskbar.dump_tree()
+            return self._get_taskbar().dump_tree()
         except Exception as e:
             return f"Error: {e}"
 
@@ -270,57 +533,96 @@ class OCREngine:
     GPU-accelerated when available.
     """
 
+    # Text boxes recognized per recognizer forward pass
+    RECOGNIZER_BATCH_SIZE = 16
+
     def __init__(self, languages: List[str] = None, gpu: bool = True):
         if not _easyocr_available:
             raise ImportError("easyocr not installed. Run: pip install easyocr")
 
         self.languages = languages or ['en']
-        self.reader = easyocr.Reader(self.languages, gpu=gpu)
-
-    def find_text_in_image(self, image: "Image.Image", min_confidence: float = 0.3) -> List[UIElement]:
-        """Find all text in an image and return locations."""
-        import numpy as np
+        # Screen captures always have the same size, so cuDNN's per-shape
+        # autotuning is paid once and reused on every later call
+        self.reader = easyocr.Reader(self.languages, gpu=gpu, cudnn_benchmark=gpu)
 
-        # Convert PIL image to numpy array
-        img_array = np.array(image)
+    def _to_elements(self, results: list, min_confidence: float) -> List[UIElement]:
+        """Convert EasyOCR (bbox, text, confidence) results into UIElements."""
+        if not results:
+            return []
 
-        # Run OCR
-        results = self.reader.readtext(img_array)
+        # bbox is [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
+        bboxes, texts, confidences = zip(*results)
+        x1s, y1s, x2s, y2s = _quad_bounds(bboxes)
 
         elements = []
-        for (bbox, text, confidence) in results:
+        for i, (text, confidence) in enumerate(zip(texts, confidences)):
             if confidence >= min_confidence and text.strip():
-                # bbox is [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
-                x1 = int(min(p[0] for p in bbox))
-                y1 = int(min(p[1] for p in bbox))
-                x2 = int(max(p[0] for p in bbox))
-                y2 = int(max(p[1] for p in bbox))
-
-                elements.append(UIElement(
+                x1, y1, x2, y2 = x1s[i], y1s[i], x2s[i], y2s[i]
+                elements.append(UIElement.from_rect(
                     name=text,
                     element_type="Text",
                     x=x1,
                     y=y1,
                     width=x2 - x1,
                     height=y2 - y1,
-                    center_x=(x1 + x2) // 2,
-                    center_y=(y1 + y2) // 2,
                     confidence=confidence,
                     source="ocr"
                 ))
 
         return elements
 
+    def find_text_in_image(self, image: "Image.Image", min_confidence: float = 0.3) -> List[UIElement]:
+        """Find all text in an image (PIL image or HxWx3 array) and return locations."""
+        import numpy as np
+
+        # Read-only view of the pixels: np.array() would copy them a second time
+        # on top of PIL's export, and EasyOCR never writes to its input
+        img_array = np.asarray(image)
+
+        # Run OCR
+        results = self.reader.readtext(img_array, batch_size=self.RECOGNIZER_BATCH_SIZE)
+
+        return self._to_elements(results, min_confidence)
+
+    def find_text_in_images(self, images: List["Image.Image"], min_confidence: float = 0.3,
+                            batch_size: int = 8) -> List[List[UIElement]]:
+        """Find all text in several images (e.g. consecutive frames) at once.
+
+        Same-sized images go through the text detector together in batches of
+        batch_size; mixed sizes fall back to one find_text_in_image() call each.
+
+        Returns one element list per image, in order.
+        """
+        import numpy as np
+
+        if not images:
+            return []
+        if len({img.size for img in images}) > 1:
+            return [self.find_text_in_image(img, min_confidence) for img in images]
+
+        elements = []
+        for start in range(0, len(images), batch_size):
+            # readtext_batched runs the detector over the whole list in one pass;
+            # its own batch_size is the recognizer's
+            arrays = [np.asarray(img) for img in images[start:start + batch_size]]
+            results = self.reader.readtext_batched(arrays, batch_size=self.RECOGNIZER_BATCH_SIZE)
+            elements.extend(self._to_elements(r, min_confidence) for r in results)
+        return elements
+
     def find_specific_text(self, image: "Image.Image", search_text: str,
                           case_sensitive: bool = False) -> List[UIElement]:
         """Find specific text in an image."""
-        all_text = self.find_text_in_image(image)
+        return self.filter_text(self.find_text_in_image(image), search_text, case_sensitive)
 
+    @staticmethod
+    def filter_text(elements: List[UIElement], search_text: str,
+                    case_sensitive: bool = False) -> List[UIElement]:
+        """Keep the text elements that contain search_text."""
         if case_sensitive:
-            return [e for e in all_text if search_text in e.name]
+            return [e for e in elements if search_text in e.name]
         else:
             search_lower = search_text.lower()
-            return [e for e in all_text if search_lower in e.name.lower()]
+            return [e for e in elements if search_lower in e.name.lower()]
 
 
 class Florence2Grounding:
@@ -329,29 +631,101 @@ class Florence2Grounding:
     Can find objects by natural language description.
     """
 
-    def __init__(self, model_name: str = "microsoft/Florence-2-large", device: str = None):
+    # (max_new_tokens, num_beams) per task. Grounding and detection answers are a
+    # handful of location tokens per box, so they don't need OCR's 1024-token
+    # budget, and greedy decoding is enough to place a single phrase.
+    GENERATION_SETTINGS = {
+        "<CAPTION_TO_PHRASE_GROUNDING>": (128, 1),
+        "<OD>": (256, 3),
+    }
+    DEFAULT_GENERATION = (1024, 3)
+
+    # Florence-2's processor always resizes to this, so encoder shapes are static
+    INPUT_SIZE = (768, 768)
+
+    QUANT_MODES = ("fp16", "int8", "nf4")
+
+    def __init__(self, model_name: str = "microsoft/Florence-2-large", device: str = None,
+                 compile_encoder: bool = False, quant: str = "fp16"):
+        """
+        Load Florence-2.
+
+        Args:
+            model_name: Hugging Face model id
+            device: "cuda" or "cpu" (default: cuda if available)
+            compile_encoder: torch.compile the image encoder (CUDA + Triton only).
+                Slower first load, faster every call after.
+            quant: Weight precision - "fp16" (fp32 on CPU), "int8" (bitsandbytes on
+                CUDA, dynamic quantization of the language model on CPU) or "nf4"
+                (4-bit bitsandbytes, CUDA only). Quantizing leaves more VRAM for
+                EasyOCR when both run on the same GPU.
+        """
         if not _florence_available:
             raise ImportError("transformers/torch not installed. Run: pip install transformers torch accelerate")
+        if quant not in self.QUANT_MODES:
+            raise ValueError(f"quant must be one of {self.QUANT_MODES}, got {quant!r}")
 
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.torch_dtype = torch.float16 if self.device == "cuda" else torch.float32
-
-        print(f"Loading Florence-2 on {self.device}...")
-        self.model = AutoModelForCausalLM.from_pretrained(
-            model_name,
-            torch_dtype=self.torch_dtype,
-            trust_remote_code=True
-        ).to(self.device)
+        if quant == "nf4" and self.device != "cuda":
+            raise ValueError("nf4 quantization needs CUDA")
+
+        print(f"Loading Florence-2 on {self.device} ({quant})...")
+        if quant != "fp16" and self.device == "cuda":
+            from transformers import BitsAndBytesConfig
+            if quant == "int8":
+                quantization_config = BitsAndBytesConfig(load_in_8bit=True, llm_int8_skip_modules=["lm_head"])
+            else:
+                quantization_config = BitsAndBytesConfig(
+                    load_in_4bit=True,
+                    bnb_4bit_compute_dtype=torch.float16,
+                    bnb_4bit_quant_type="nf4"
+                )
+            # Quantized weights are placed on the GPU at load and can't be moved with .to();
+            # activations stay in torch_dtype
+            self.model = AutoModelForCausalLM.from_pretrained(
+                model_name,
+                torch_dtype=self.torch_dtype,
+                trust_remote_code=True,
+                quantization_config=quantization_config,
+                device_map=self.device
+            )
+        else:
+            self.model = AutoModelForCausalLM.from_pretrained(
+                model_name,
+                torch_dtype=self.torch_dtype,
+                trust_remote_code=True
+            ).to(self.device)
+            if quant == "int8":
+                # bitsandbytes is CUDA-only; on CPU quantize the language model's
+                # Linear layers dynamically (int8 weights, fp32 activations)
+                self.model.language_model = torch.ao.quantization.quantize_dynamic(
+                    self.model.language_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
 
         self.processor = AutoProcessor.from_pretrained(
             model_name,
             trust_remote_code=True
         )
+
+        if compile_encoder:
+            # generate() calls self._encode_image, so shadowing it on the instance
+            # routes every call through the compiled version; the decoder's
+            # growing sequence length would defeat CUDA graphs, so it stays eager
+            self.model._encode_image = torch.compile(
+                self.model._encode_image, mode="reduce-overhead", fullgraph=False
+            )
+            warmup = self.processor(
+                text="<OD>", images=Image.new("RGB", self.INPUT_SIZE), return_tensors="pt"
+            ).to(self.device, self.torch_dtype)
+            with torch.inference_mode():
+                self.model._encode_image(warmup["pixel_values"])
         print("Florence-2 loaded!")
 
     def _run_task(self, image: "Image.Image", task: str, text_input: str = None) -> dict:
         """Run a Florence-2 task on an image."""
         prompt = task if text_input is None else task + text_input
+        max_new_tokens, num_beams = self.GENERATION_SETTINGS.get(task, self.DEFAULT_GENERATION)
 
         inputs = self.processor(
             text=prompt,
@@ -359,12 +733,13 @@ class Florence2Grounding:
             return_tensors="pt"
         ).to(self.device, self.torch_dtype)
 
-        generated_ids = self.model.generate(
-            input_ids=inputs["input_ids"],
-            pixel_values=inputs["pixel_values"],
-            max_new_tokens=1024,
-            num_beams=3
-        )
+        with torch.inference_mode():
+            generated_ids = self.model.generate(
+                input_ids=inputs["input_ids"],
+                pixel_values=inputs["pixel_values"],
+                max_new_tokens=max_new_tokens,
+                num_beams=num_beams
+            )
 
         generated_text = self.processor.batch_decode(generated_ids, skip_special_tokens=False)[0]
 
@@ -374,6 +749,73 @@ class Florence2Grounding:
             image_size=(image.width, image.height)
         )
 
+    def _run_task_batched(self, image: "Image.Image", task: str, text_inputs: List[str]) -> List[dict]:
+        """Run one Florence-2 task with several text inputs on the same image.
+
+        The image goes through the vision encoder once; its features are shared
+        by all prompts, which are padded into one batch for the language model.
+        """
+        prompts = [task + text for text in text_inputs]
+        max_new_tokens, num_beams = self.GENERATION_SETTINGS.get(task, self.DEFAULT_GENERATION)
+
+        inputs = self.processor(
+            text=prompts,
+            images=image,
+            padding=True,
+            return_tensors="pt"
+        ).to(self.device, self.torch_dtype)
+
+        with torch.inference_mode():
+            # Same merge Florence-2's generate() does for one prompt, except the
+            # text part keeps its padding mask
+            image_features = self.model._encode_image(inputs["pixel_values"])
+            image_features = image_features.expand(len(prompts), -1, -1)
+            text_embeds = self.model.get_input_embeddings()(inputs["input_ids"])
+            text_mask = inputs["attention_mask"]
+            image_mask = torch.ones(image_features.shape[:2], dtype=text_mask.dtype, device=text_mask.device)
+
+            generated_ids = self.model.language_model.generate(
+                input_ids=None,
+                inputs_embeds=torch.cat([image_features, text_embeds], dim=1),
+                attention_mask=torch.cat([image_mask, text_mask], dim=1),
+                max_new_tokens=max_new_tokens,
+                num_beams=num_beams
+            )
+
+        generated_texts = self.processor.batch_decode(generated_ids, skip_special_tokens=False)
+
+        return [
+            self.processor.post_process_generation(
+                text,
+                task=task,
+                image_size=(image.width, image.height)
+            )
+            for text in generated_texts
+        ]
+
+    @staticmethod
+    def _grounded_elements(result: dict) -> List[UIElement]:
+        """Convert a <CAPTION_TO_PHRASE_GROUNDING> result into UIElements."""
+        elements = []
+        if "<CAPTION_TO_PHRASE_GROUNDING>" in result:
+            data = result["<CAPTION_TO_PHRASE_GROUNDING>"]
+            bboxes = data.get("bboxes", [])
+            labels = data.get("labels", [])
+
+            for bbox, label in zip(bboxes, labels):
+                x1, y1, x2, y2 = [int(v) for v in bbox]
+                elements.append(UIElement.from_rect(
+                    name=label,
+                    element_type="GroundedObject",
+                    x=x1,
+                    y=y1,
+                    width=x2 - x1,
+                    height=y2 - y1,
+                    source="florence"
+                ))
+
+        return elements
+
     def find_by_description(self, image: "Image.Image", description: str) -> List[UIElement]:
         """
         Find elements matching a natural language description.
@@ -382,31 +824,27 @@ class Florence2Grounding:
         try:
             # Use phrase grounding to find the described element
             result = self._run_task(image, "<CAPTION_TO_PHRASE_GROUNDING>", description)
+            return self._grounded_elements(result)
+        except Exception as e:
+            print(f"Florence-2 grounding error: {e}")
+            return []
 
-            elements = []
-            if "<CAPTION_TO_PHRASE_GROUNDING>" in result:
-                data = result["<CAPTION_TO_PHRASE_GROUNDING>"]
-                bboxes = data.get("bboxes", [])
-                labels = data.get("labels", [])
+    def find_by_descriptions(self, image: "Image.Image", descriptions: List[str]) -> List[List[UIElement]]:
+        """
+        Find elements for several descriptions in the same image.
+        Encodes the image once instead of once per description.
 
-                for bbox, label in zip(bboxes, labels):
-                    x1, y1, x2, y2 = [int(v) for v in bbox]
-                    elements.append(UIElement(
-                        name=label,
-                        element_type="GroundedObject",
-                        x=x1,
-                        y=y1,
-                        width=x2 - x1,
-                        height=y2 - y1,
-                        center_x=(x1 + x2) // 2,
-                        center_y=(y1 + y2) // 2,
-                        source="florence"
-                    ))
+        Returns one element list per description, in order.
+        """
+        if len(descriptions) <= 1:
+            return [self.find_by_description(image, d) for d in descriptions]
 
-            return elements
+        try:
+            results = self._run_task_batched(image, "<CAPTION_TO_PHRASE_GROUNDING>", descriptions)
+            return [self._grounded_elements(result) for result in results]
         except Exception as e:
             print(f"Florence-2 grounding error: {e}")
-            return []
+            return [[] for _ in descriptions]
 
     def detect_all_objects(self, image: "Image.Image") -> List[UIElement]:
         """Detect all objects in the image."""
@@ -421,15 +859,13 @@ class Florence2Grounding:
 
                 for bbox, label in zip(bboxes, labels):
                     x1, y1, x2, y2 = [int(v) for v in bbox]
-                    elements.append(UIElement(
+                    elements.append(UIElement.from_rect(
                         name=label,
                         element_type="DetectedObject",
                         x=x1,
                         y=y1,
                         width=x2 - x1,
                         height=y2 - y1,
-                        center_x=(x1 + x2) // 2,
-                        center_y=(y1 + y2) // 2,
                         source="florence"
                     ))
 
@@ -449,22 +885,16 @@ class Florence2Grounding:
                 quad_boxes = data.get("quad_boxes", [])
                 labels = data.get("labels", [])
 
-                for quad, label in zip(quad_boxes, labels):
-                    # quad is [x1,y1, x2,y1, x2,y2, x1,y2]
-                    xs = [quad[i] for i in [0, 2, 4, 6]]
-                    ys = [quad[i] for i in [1, 3, 5, 7]]
-                    x1, x2 = int(min(xs)), int(max(xs))
-                    y1, y2 = int(min(ys)), int(max(ys))
-
-                    elements.append(UIElement(
+                # quad is [x1,y1, x2,y1, x2,y2, x1,y2]
+                bounds = _quad_bounds(quad_boxes) if quad_boxes else ([], [], [], [])
+                for label, x1, y1, x2, y2 in zip(labels, *bounds):
+                    elements.append(UIElement.from_rect(
                         name=label,
                         element_type="Text",
                         x=x1,
                         y=y1,
                         width=x2 - x1,
                         height=y2 - y1,
-                        center_x=(x1 + x2) // 2,
-                        center_y=(y1 + y2) // 2,
                         source="florence-ocr"
                     ))
 
@@ -480,6 +910,10 @@ class SmartElementFinder:
     Tries the most reliable method first, falls back to others.
     """
 
+    # Back-to-back lookups (e.g. find text, then find a described element)
+    # share a capture this recent instead of grabbing the screen again
+    FRAME_MAX_AGE = 0.05
+
     def __init__(self, use_uia: bool = True, use_ocr: bool = True,
                  use_florence: bool = False, ocr_gpu: bool = True):
         """
@@ -499,6 +933,22 @@ class SmartElementFinder:
         self._use_florence = use_florence and _florence_available
         self._florence_loaded = False
 
+        # One capture backend for all captures (mss holds GDI device contexts,
+        # dxcam a DXGI duplication); created on first use and guarded since
+        # captures may come from threads
+        self._sct = None
+        self._camera = None
+        self._last_frame = None
+        self._last_capture = None  # (monotonic time, Image) of the latest capture
+        # OCR of the last full frame as (Image, SHA-1 of its pixels, elements), so
+        # polling an idle screen doesn't re-run OCR on identical pixels
+        self._ocr_cache = None
+        self._sct_lock = threading.Lock()
+
+        # Runs OCR while UIA is queried on the calling thread (UIA's COM objects
+        # belong to the thread that created them, so they stay there)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smart-find-ocr")
+
     def _ensure_florence(self):
         """Lazy load Florence-2 model."""
         if self._use_florence and not self._florence_loaded:
@@ -509,15 +959,113 @@ class SmartElementFinder:
                 print(f"Failed to load Florence-2: {e}")
                 self._use_florence = False
 
-    def capture_screen(self) -> "Image.Image":
-        """Capture the current screen."""
+    def _capture_dxcam(self) -> Optional["Image.Image"]:
+        """Capture the primary monitor via DXGI Desktop Duplication, or None if unavailable."""
+        with self._sct_lock:
+            if self._camera is None:
+                try:
+                    self._camera = dxcam.create(output_idx=0, output_color="RGB")
+                except Exception as e:
+                    print(f"dxcam unavailable, falling back to mss: {e}")
+                    self._camera = False
+            if not self._camera:
+                return None
+            # grab() returns None when nothing changed since the last frame; hand
+            # back the same Image then, so OCR results cached for it are reused
+            frame = self._camera.grab()
+            if frame is not None:
+                self._last_frame = Image.fromarray(frame)
+            return self._last_frame
+
+    def capture_screen(self, max_age: float = 0.0) -> "Image.Image":
+        """Capture the current screen (dxcam if installed, otherwise mss).
+
+        Args:
+            max_age: Return the previous capture instead if it is at most this
+                many seconds old. 0 always captures a fresh frame.
+        """
+        last = self._last_capture
+        if last is not None and time.monotonic() - last[0] <= max_age:
+            return last[1]
+
+        image = self._grab_screen()
+        self._last_capture = (time.monotonic(), image)
+        return image
+
+    def _grab_screen(self) -> "Image.Image":
+        """Capture a fresh frame of the primary monitor."""
+        if _dxcam_available:
+            image = self._capture_dxcam()
+            if image is not None:
+                return image
+
         if not _mss_available:
             raise ImportError("mss not installed. Run: pip install mss")
 
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]
-            screenshot = sct.grab(monitor)
-            return Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+        with self._sct_lock:
+            if self._sct is None:
+                self._sct = mss.mss()
+            screenshot = self._sct.grab(self._sct.monitors[1])
+        # .raw is mss's own buffer; .bgra would copy the whole frame into bytes first
+        return Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
+
+    def _region_screenshot(self, region: Tuple[int, int, int, int],
+                           screenshot: "Image.Image" = None) -> Tuple["Image.Image", int, int]:
+        """Image of just one screen region, so OCR/Florence skip everything else.
+
+        Crops the given (or a recent) screenshot; otherwise mss grabs only the
+        region itself.
+
+        Args:
+            region: (left, top, width, height) in screen coordinates, clipped to the screen
+            screenshot: Full screenshot to crop instead of capturing
+
+        Returns:
+            (image, left, top) - add left/top to coordinates found in the image
+        """
+        last = self._last_capture
+        if screenshot is None and last is not None and time.monotonic() - last[0] <= self.FRAME_MAX_AGE:
+            screenshot = last[1]
+
+        if screenshot is None and _mss_available and not (_dxcam_available and self._camera is not False):
+            with self._sct_lock:
+                if self._sct is None:
+                    self._sct = mss.mss()
+                monitor = self._sct.monitors[1]
+                left, top, right, bottom = _clamp_region(region, monitor["width"], monitor["height"])
+                shot = self._sct.grab({
+                    "left": monitor["left"] + left,
+                    "top": monitor["top"] + top,
+                    "width": right - left,
+                    "height": bottom - top,
+                })
+            return Image.frombytes("RGB", shot.size, shot.raw, "raw", "BGRX"), left, top
+
+        # dxcam captures the whole output anyway - cropping it is nearly free
+        if screenshot is None:
+            screenshot = self.capture_screen()
+        left, top, right, bottom = _clamp_region(region, screenshot.width, screenshot.height)
+        return screenshot.crop((left, top, right, bottom)), left, top
+
+    def _all_text(self, screenshot: "Image.Image") -> List[UIElement]:
+        """OCR every text element in a full screenshot, reusing the last result
+        when the pixels haven't changed (hashing costs tens of ms, OCR hundreds)."""
+        cached = self._ocr_cache
+        if cached is not None and cached[0] is screenshot:
+            return cached[2]
+
+        digest = hashlib.sha1(screenshot.tobytes()).digest()
+        if cached is not None and cached[1] == digest:
+            self._ocr_cache = (screenshot, digest, cached[2])
+            return cached[2]
+
+        elements = self.ocr.find_text_in_image(screenshot)
+        self._ocr_cache = (screenshot, digest, elements)
+        return elements
+
+    def _find_text(self, screenshot: "Image.Image", text: str) -> List[UIElement]:
+        """Text elements in a full screenshot that contain text (case-insensitive)."""
+        return OCREngine.filter_text(self._all_text(screenshot), text)
 
     def find_taskbar_app(self, app_name: str) -> Optional[UIElement]:
         """Find an app in the taskbar. Uses UI Automation (most reliable)."""
@@ -543,35 +1091,61 @@ class SmartElementFinder:
             return self.uia.get_all_windows()
         return []
 
-    def find_text_on_screen(self, text: str, screenshot: "Image.Image" = None) -> List[UIElement]:
-        """Find text on screen using OCR."""
+    def find_text_on_screen(self, text: str, screenshot: "Image.Image" = None,
+                            region: Tuple[int, int, int, int] = None) -> List[UIElement]:
+        """Find text on screen using OCR.
+
+        Args:
+            text: Text to find
+            screenshot: Optional full screenshot (will capture if not provided)
+            region: Only search (left, top, width, height), e.g. a window's rect
+                from find_window() - much faster than the whole screen
+        """
         if not self.ocr:
             return []
 
+        if region is not None:
+            image, left, top = self._region_screenshot(region, screenshot)
+            return _offset_elements(self.ocr.find_specific_text(image, text), left, top)
+
         if screenshot is None:
-            screenshot = self.capture_screen()
+            screenshot = self.capture_screen(max_age=self.FRAME_MAX_AGE)
 
-        return self.ocr.find_specific_text(screenshot, text)
+        return self._find_text(screenshot, text)
 
-    def get_all_text_on_screen(self, screenshot: "Image.Image" = None) -> List[UIElement]:
-        """Get all text visible on screen."""
+    def get_all_text_on_screen(self, screenshot: "Image.Image" = None,
+                               region: Tuple[int, int, int, int] = None) -> List[UIElement]:
+        """Get all text visible on screen (or within region, see find_text_on_screen)."""
         if not self.ocr:
             return []
 
+        if region is not None:
+            image, left, top = self._region_screenshot(region, screenshot)
+            return _offset_elements(self.ocr.find_text_in_image(image), left, top)
+
         if screenshot is None:
-            screenshot = self.capture_screen()
+            screenshot = self.capture_screen(max_age=self.FRAME_MAX_AGE)
 
-        return self.ocr.find_text_in_image(screenshot)
+        return list(self._all_text(screenshot))
 
-    def find_by_description(self, description: str, screenshot: "Image.Image" = None) -> List[UIElement]:
-        """Find elements by natural language description using Florence-2."""
+    def find_by_description(self, description: str, screenshot: "Image.Image" = None,
+                            region: Tuple[int, int, int, int] = None) -> List[UIElement]:
+        """Find elements by natural language description using Florence-2.
+
+        A region (see find_text_on_screen) also gives Florence-2 more detail, since
+        its input is always resized to 768x768.
+        """
         self._ensure_florence()
 
         if not self.florence:
             return []
 
+        if region is not None:
+            image, left, top = self._region_screenshot(region, screenshot)
+            return _offset_elements(self.florence.find_by_description(image, description), left, top)
+
         if screenshot is None:
-            screenshot = self.capture_screen()
+            screenshot = self.capture_screen(max_age=self.FRAME_MAX_AGE)
 
         return self.florence.find_by_description(screenshot, description)
 
@@ -588,6 +1162,14 @@ class SmartElementFinder:
         """
         results = []
 
+        # 2. Start OCR for text in the background - it runs on the GPU while
+        # the UIA queries below wait on cross-process COM calls
+        ocr_future = None
+        if self.ocr:
+            if screenshot is None:
+                screenshot = self.capture_screen(max_age=self.FRAME_MAX_AGE)
+            ocr_future = self._pool.submit(self._find_text, screenshot, query)
+
         # 1. Try UI Automation first (most reliable for apps/windows)
         if self.uia:
             # Check if it's a window
@@ -600,19 +1182,15 @@ class SmartElementFinder:
             if app:
                 results.append(app)
 
-        # 2. Try OCR for text
-        if self.ocr:
-            if screenshot is None:
-                screenshot = self.capture_screen()
-            text_matches = self.ocr.find_specific_text(screenshot, query)
-            results.extend(text_matches)
+        if ocr_future is not None:
+            results.extend(ocr_future.result())
 
         # 3. Try Florence-2 for visual grounding (only if no results yet)
         if not results and self._use_florence:
             self._ensure_florence()
             if self.florence:
                 if screenshot is None:
-                    screenshot = self.capture_screen()
+                    screenshot = self.capture_screen(max_age=self.FRAME_MAX_AGE)
                 visual_matches = self.florence.find_by_description(screenshot, query)
                 results.extend(visual_matches)
 
@@ -666,7 +1244,7 @@ def test_ocr():
     with mss.mss() as sct:
         monitor = sct.monitors[1]
         screenshot = sct.grab(monitor)
-        image = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+        image = Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
 
     ocr = OCREngine(gpu=True)
 
@@ -690,7 +1268,7 @@ def test_florence():
     with mss.mss() as sct:
         monitor = sct.monitors[1]
         screenshot = sct.grab(monitor)
-        image = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+        image = Image.frombytes("RGB", screenshot.size, screenshot.raw, "raw", "BGRX")
 
     florence = Florence2Grounding()
 
@@ -747,6 +1325,7 @@ if __name__ == "__main__":
     print(f"easyocr available: {_easyocr_available}")
     print(f"florence available: {_florence_available}")
     print(f"mss available: {_mss_available}")
+    print(f"dxcam available: {_dxcam_available}")
 
     if len(sys.argv) > 1:
         test = sys.argv[1]
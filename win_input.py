@@ -0,0 +1,187 @@
+"""
+Native Windows Input via SendInput
+
+Sends keyboard and mouse input straight to the Win32 SendInput API. A whole
+string becomes one batch of KEYEVENTF_UNICODE events delivered in a single call,
+instead of one pyautogui keypress (plus a sleep) per character; a click is one
+SetCursorPos plus one SendInput with all the button transitions.
+
+Only functional on Windows - check AVAILABLE before calling.
+"""
+
+import ctypes
+import sys
+import time
+from ctypes import wintypes
+
+AVAILABLE = sys.platform == "win32"
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+
+# button name -> (down flag, up flag)
+_BUTTON_FLAGS = {
+    "left": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    "right": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+    "middle": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+}
+
+VK_TAB = 0x09
+VK_RETURN = 0x0D
+
+# Characters that apps expect as real virtual keys rather than unicode events
+_VIRTUAL_KEYS = {
+    "\n": VK_RETURN,
+    "\t": VK_TAB,
+}
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [
+        ("mi", MOUSEINPUT),
+        ("ki", KEYBDINPUT),
+        ("hi", HARDWAREINPUT),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("u", _INPUTUNION),
+    ]
+
+
+def _key_events(text: str) -> list[INPUT]:
+    """Build key down/up INPUT pairs for every character in text."""
+    events = []
+    for char in text:
+        vk = _VIRTUAL_KEYS.get(char)
+        if vk is not None:
+            down = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=0)
+            up = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=KEYEVENTF_KEYUP)
+            events.append(INPUT(type=INPUT_KEYBOARD, ki=down))
+            events.append(INPUT(type=INPUT_KEYBOARD, ki=up))
+            continue
+
+        # KEYEVENTF_UNICODE takes UTF-16 code units (surrogate pairs for astral chars)
+        encoded = char.encode("utf-16-le")
+        for i in range(0, len(encoded), 2):
+            unit = int.from_bytes(encoded[i:i + 2], "little")
+            down = KEYBDINPUT(wVk=0, wScan=unit, dwFlags=KEYEVENTF_UNICODE)
+            up = KEYBDINPUT(wVk=0, wScan=unit, dwFlags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)
+            events.append(INPUT(type=INPUT_KEYBOARD, ki=down))
+            events.append(INPUT(type=INPUT_KEYBOARD, ki=up))
+    return events
+
+
+def send_inputs(events: list[INPUT]) -> None:
+    """Dispatch INPUT events in one SendInput call."""
+    if not events:
+        return
+    array = (INPUT * len(events))(*events)
+    sent = ctypes.windll.user32.SendInput(len(events), array, ctypes.sizeof(INPUT))
+    if sent != len(events):
+        # Usually UIPI: the foreground window belongs to a more privileged process
+        raise ctypes.WinError()
+
+
+def type_text(text: str, interval: float = 0.0) -> None:
+    """Type text (any unicode) via SendInput.
+
+    Args:
+        text: Text to type
+        interval: Seconds to wait between characters. 0 sends everything in one batch.
+    """
+    text = text.replace("\r\n", "\n")
+    if interval <= 0:
+        send_inputs(_key_events(text))
+        return
+
+    for char in text:
+        send_inputs(_key_events(char))
+        time.sleep(interval)
+
+
+def move_to(x: int, y: int) -> None:
+    """Move the cursor to screen coordinates (x, y)."""
+    if not ctypes.windll.user32.SetCursorPos(x, y):
+        raise ctypes.WinError()
+
+
+def click(x: int, y: int, button: str = "left", clicks: int = 1) -> None:
+    """Click at (x, y), sending every down/up transition in one SendInput call.
+
+    Args:
+        x: X coordinate (pixels from left edge)
+        y: Y coordinate (pixels from top edge)
+        button: "left", "right" or "middle"
+        clicks: Number of clicks (2 for a double click)
+    """
+    down, up = _BUTTON_FLAGS[button]
+    move_to(x, y)
+    events = []
+    for _ in range(clicks):
+        events.append(INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(dwFlags=down)))
+        events.append(INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(dwFlags=up)))
+    send_inputs(events)
+
+
+def foreground_window() -> int:
+    """Handle of the current foreground window (0 if none)."""
+    return ctypes.windll.user32.GetForegroundWindow() or 0
+
+
+def wait_for_foreground_change(previous: int, timeout: float, poll: float = 0.01) -> bool:
+    """Poll until the foreground window differs from previous.
+
+    Returns:
+        True if it changed within timeout, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    while foreground_window() == previous:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+    return True